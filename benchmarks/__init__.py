@@ -0,0 +1 @@
+"""Benchmark suite for tanchi, run with `python -m benchmarks`."""
@@ -0,0 +1,108 @@
+"""Run tanchi's benchmarks.
+
+python -m benchmarks run --output results.json
+python -m benchmarks compare baseline.json results.json --threshold 0.1
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import typing
+
+from benchmarks.suite import BENCHMARKS
+
+Results = typing.Dict[str, typing.Dict[str, float]]
+
+
+def measure(setup: typing.Callable[[], typing.Callable[[], typing.Any]], repeat: int) -> typing.Dict[str, float]:
+    """Measure the best time and the peak memory of a benchmark."""
+    run = setup()
+    run()  # warm up caches and imports
+
+    timings: typing.List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+
+def run_benchmarks(patterns: typing.Sequence[str], repeat: int) -> Results:
+    results: Results = {}
+    for name, setup in BENCHMARKS.items():
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+
+        results[name] = result = measure(setup, repeat)
+        print(f"{name:<40} {result['seconds'] * 1000:>12.3f} ms {result['peak_bytes'] / 1024:>12.1f} KiB")
+
+    return results
+
+
+def compare(baseline: Results, current: Results, threshold: float, memory_threshold: float) -> bool:
+    """Compare results and report every regressed benchmark."""
+    ok = True
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+
+        for metric, limit in (("seconds", threshold), ("peak_bytes", memory_threshold)):
+            before, after = baseline[name][metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = change > limit
+            ok = ok and not regressed
+
+            marker = "REGRESSED" if regressed else ""
+            print(f"{name:<40} {metric:<10} {before:>14.6g} -> {after:<14.6g} {change:>+8.1%} {marker}")
+
+    return ok
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("patterns", nargs="*", default=["*"], help="glob patterns of benchmarks to run")
+    run_parser.add_argument("--repeat", type=int, default=5, help="amount of measured runs")
+    run_parser.add_argument("--output", "-o", help="file to save the results to")
+
+    compare_parser = subparsers.add_parser("compare", help="fail if any benchmark regressed")
+    compare_parser.add_argument("baseline", help="results of the baseline")
+    compare_parser.add_argument("current", help="results of the change")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative time increase")
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.1, help="allowed relative memory increase")
+
+    args = parser.parse_args(argv)
+
+    if args.mode == "run":
+        results = run_benchmarks(args.patterns, args.repeat)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=4)
+
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+
+    return 0 if compare(baseline, current, args.threshold, args.memory_threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
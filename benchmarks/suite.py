@@ -0,0 +1,407 @@
+"""Benchmarks for tanchi's hot paths.
+
+Every benchmark is a function returning a callable which performs a single run.
+The setup is done outside of the measured callable.
+"""
+import asyncio
+import datetime
+import enum
+import inspect
+import os
+import tempfile
+import typing
+
+import alluka
+import hikari
+import tanjun
+
+from tanchi import autocompletion, conversion, indexes, messages, parser, types
+
+__all__ = ["BENCHMARKS", "SIZES", "make_commands"]
+
+SIZES = (10, 100, 1000, 5000)
+"""Amount of synthetic commands created by the command construction benchmarks"""
+
+BenchmarkSig = typing.Callable[[], typing.Callable[[], typing.Any]]
+
+BENCHMARKS: typing.Dict[str, BenchmarkSig] = {}
+
+
+def benchmark(name: str) -> typing.Callable[[BenchmarkSig], BenchmarkSig]:
+    """Register a benchmark."""
+
+    def decorator(func: BenchmarkSig) -> BenchmarkSig:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+class Color(enum.IntEnum):
+    red = 0xFF0000
+    green = 0x00FF00
+    blue = 0x0000FF
+
+
+def autocomplete_words(context: tanjun.abc.AutocompleteContext, value: str) -> typing.List[str]:
+    return [word for word in ("foo", "bar", "baz") if value in word]
+
+
+ANNOTATIONS: typing.Sequence[typing.Any] = [
+    str,
+    int,
+    float,
+    bool,
+    typing.Optional[hikari.Member],
+    hikari.User,
+    hikari.Role,
+    typing.Union[hikari.GuildTextChannel, hikari.GuildNewsChannel],
+    typing.Literal["foo", "bar", "baz"],
+    Color,
+    types.Range[1, 10],
+    types.Range[0.0, 1.0],
+    types.Converted[int, round],
+    hikari.Emoji,
+    datetime.datetime,
+    types.Autocompleted[autocomplete_words],
+]
+"""Varied annotations used by the synthetic commands"""
+
+OPTIONS_PER_COMMAND = 5
+
+DOCSTRINGS = {
+    "rest": """Command description on a single line
+
+    Parameters
+    ----------
+    foo : str
+        Description for the option named "foo"
+    bar : int
+        Description for the option named "bar"
+        spanning multiple lines
+    baz:
+        Description for the option named "baz"
+    """,
+    "google": """Command description on a single line
+
+    Args:
+        foo (str): Description for the option named "foo"
+        bar (int, optional): Description for the option named "bar"
+        baz: Description for the option named "baz"
+    """,
+}
+
+
+def make_function(index: int) -> typing.Callable[..., typing.Any]:
+    """Make a synthetic command callback with a varied signature."""
+
+    async def callback(ctx: tanjun.abc.SlashContext, **kwargs: typing.Any) -> None: ...
+
+    parameters = [inspect.Parameter("ctx", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=tanjun.abc.SlashContext)]
+    lines = [f"Synthetic command number {index}", "", "Parameters", "----------"]
+
+    for i in range(OPTIONS_PER_COMMAND):
+        name = f"option_{i}"
+        annotation = ANNOTATIONS[(index + i) % len(ANNOTATIONS)]
+        default = inspect.Parameter.empty if i < 2 else None
+
+        parameters.append(
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation, default=default)
+        )
+        lines += [f"{name} : {annotation!r}", f"    Description of option {i}"]
+
+    callback.__name__ = f"command_{index}"
+    callback.__doc__ = "\n".join(lines)
+    callback.__annotations__ = {parameter.name: parameter.annotation for parameter in parameters}
+    callback.__signature__ = inspect.Signature(parameters)  # type: ignore[attr-defined]
+    return callback
+
+
+def make_commands(size: int) -> typing.Sequence[typing.Callable[..., typing.Any]]:
+    """Make a synthetic set of command callbacks."""
+    return [make_function(index) for index in range(size)]
+
+
+def _create_commands(size: int) -> BenchmarkSig:
+    def setup() -> typing.Callable[[], typing.Any]:
+        functions = make_commands(size)
+        return lambda: [parser.create_command(function) for function in functions]
+
+    return setup
+
+
+for _size in SIZES:
+    benchmark(f"create_command[{_size}]")(_create_commands(_size))
+
+
+@benchmark("parse_parameter")
+def parse_parameter() -> typing.Callable[[], typing.Any]:
+    def run() -> None:
+        for annotation in ANNOTATIONS:
+            parser.parse_parameter("option", annotation, description="Description")
+
+    return run
+
+
+@benchmark("parse_docstring[rest]")
+def parse_docstring_rest() -> typing.Callable[[], typing.Any]:
+    return lambda: parser.parse_docstring(DOCSTRINGS["rest"])
+
+
+@benchmark("parse_docstring[google]")
+def parse_docstring_google() -> typing.Callable[[], typing.Any]:
+    return lambda: parser.parse_docstring(DOCSTRINGS["google"])
+
+
+@benchmark("get_converters")
+def get_converters() -> typing.Callable[[], typing.Any]:
+    return conversion.get_converters
+
+
+class FakeAutocompleteContext:
+    """The bare minimum of an autocomplete context used by tanchi."""
+
+    has_responded = False
+
+    async def set_choices(self, choices: typing.Any = (), **kwargs: typing.Any) -> None: ...
+
+
+def _run_autocomplete(callback: typing.Callable[..., typing.Any], calls: int = 1000) -> typing.Callable[[], typing.Any]:
+    loop = asyncio.new_event_loop()
+    context = FakeAutocompleteContext()
+
+    async def run() -> None:
+        for _ in range(calls):
+            await callback(context, "ba")
+
+    return lambda: loop.run_until_complete(run())
+
+
+@benchmark("autocomplete[direct]")
+def autocomplete_direct() -> typing.Callable[[], typing.Any]:
+    async def callback(context: FakeAutocompleteContext, value: str) -> None:
+        await context.set_choices(
+            {word: word for word in autocomplete_words(typing.cast("typing.Any", context), value)}
+        )
+
+    return _run_autocomplete(callback)
+
+
+@benchmark("autocomplete[as_autocomplete]")
+def autocomplete_wrapped() -> typing.Callable[[], typing.Any]:
+    return _run_autocomplete(autocompletion.as_autocomplete(autocomplete_words))
+
+
+STATIC_CHOICES = [f"choice {index}" for index in range(autocompletion.MAX_CHOICES)]
+"""A fixed result set of the most choices discord allows"""
+
+
+class FakeAutocompleteInteraction:
+    """The bare minimum of an autocomplete interaction used by tanjun's context."""
+
+    command_name = "command"
+    options = [
+        hikari.AutocompleteInteractionOption(
+            name="option", type=hikari.OptionType.STRING, value="ch", options=None, is_focused=True
+        )
+    ]
+
+    async def create_response(self, choices: typing.Any) -> None: ...
+
+
+class FakeClient:
+    """The bare minimum of a client used by tanjun's contexts."""
+
+    injector = alluka.Client()
+
+
+def _run_static_autocomplete(
+    callback: typing.Callable[..., typing.Any], calls: int = 1000
+) -> typing.Callable[[], typing.Any]:
+    loop = asyncio.new_event_loop()
+    client = typing.cast("typing.Any", FakeClient())
+    interaction = typing.cast("typing.Any", FakeAutocompleteInteraction())
+
+    async def run() -> None:
+        for _ in range(calls):
+            await callback(tanjun.context.AutocompleteContext(client, interaction), "ch")
+
+    return lambda: loop.run_until_complete(run())
+
+
+@benchmark("autocomplete[static/set_choices]")
+def autocomplete_static_set_choices() -> typing.Callable[[], typing.Any]:
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str) -> None:
+        await context.set_choices({choice: choice for choice in STATIC_CHOICES})
+
+    return _run_static_autocomplete(callback)
+
+
+@benchmark("autocomplete[static/as_autocomplete]")
+def autocomplete_static_cached() -> typing.Callable[[], typing.Any]:
+    return _run_static_autocomplete(autocompletion.as_autocomplete(lambda context, value: STATIC_CHOICES))
+
+
+@benchmark("autocomplete[static/payload]")
+def autocomplete_static_payload() -> typing.Callable[[], typing.Any]:
+    payload = autocompletion.ChoicePayload(STATIC_CHOICES)
+    return _run_static_autocomplete(autocompletion.as_autocomplete(lambda context, value: payload))
+
+
+VOCABULARY = [f"{word}{index}" for index in range(20_000) for word in ("apple", "banana", "cherry", "durian", "elder")]
+"""A large choice vocabulary of 100000 words"""
+
+
+def _run_searches(search: typing.Callable[[str], typing.Any], calls: int = 50) -> typing.Callable[[], typing.Any]:
+    prefixes = [f"{word}{index}" for index in range(calls // 5) for word in ("a", "b", "ch", "dur", "elder1")]
+    return lambda: [search(prefix) for prefix in prefixes]
+
+
+@benchmark("choice_search[list]")
+def choice_search_list() -> typing.Callable[[], typing.Any]:
+    folded = [(word.casefold(), word) for word in VOCABULARY]
+    return _run_searches(lambda prefix: [word for key, word in folded if key.startswith(prefix.casefold())][:25])
+
+
+@benchmark("choice_search[index]")
+def choice_search_index() -> typing.Callable[[], typing.Any]:
+    path = os.path.join(tempfile.mkdtemp(), "vocabulary.index")
+    indexes.build_index(VOCABULARY, path)
+    return _run_searches(indexes.ChoiceIndex(path).search)
+
+
+@benchmark("ToDatetime")
+def to_datetime() -> typing.Callable[[], typing.Any]:
+    converter = conversion.ToDatetime()
+    arguments = ["<t:297388800:R>", "297388800", "2001-09-11T00:46:00+00:00"] * 100
+
+    def run() -> None:
+        for argument in arguments:
+            converter(argument)
+
+    return run
+
+
+class FakeOption:
+    """The bare minimum of a slash option used when processing arguments."""
+
+    def __init__(self, option_type: hikari.OptionType, value: typing.Any) -> None:
+        self.type = option_type
+        self.value = value
+
+    def resolve_to_member(self, *, default: typing.Any = None) -> typing.Any:
+        return self.value
+
+    def resolve_to_user(self) -> typing.Any:
+        return self.value
+
+    def resolve_to_channel(self) -> typing.Any:
+        return self.value
+
+
+class FakeSlashContext:
+    """The bare minimum of a slash context used when processing arguments."""
+
+    def __init__(self, options: typing.Mapping[str, FakeOption]) -> None:
+        self.options = options
+
+    async def call_with_async_di(self, callback: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        return callback(*args)
+
+
+async def _invoker_command(
+    ctx: tanjun.abc.SlashContext,
+    string: str,
+    number: float,
+    member: hikari.Member,
+    channel: typing.Optional[hikari.GuildTextChannel] = None,
+    converted: types.Converted[int] = 0,
+    missing: int = 0,
+) -> None:
+    """Command with varied options."""
+
+
+def _run_process_args(generic: bool, calls: int = 1000) -> typing.Callable[[], typing.Any]:
+    command = parser.create_command(_invoker_command)
+    process_args = tanjun.SlashCommand._process_args if generic else type(command)._process_args
+    context = typing.cast(
+        "typing.Any",
+        FakeSlashContext(
+            {
+                "string": FakeOption(hikari.OptionType.STRING, "string"),
+                "number": FakeOption(hikari.OptionType.FLOAT, 1.0),
+                "member": FakeOption(hikari.OptionType.USER, object()),
+                "channel": FakeOption(hikari.OptionType.CHANNEL, object()),
+                "converted": FakeOption(hikari.OptionType.STRING, "42"),
+            }
+        ),
+    )
+    loop = asyncio.new_event_loop()
+
+    async def run() -> None:
+        for _ in range(calls):
+            await process_args(command, context)
+
+    return lambda: loop.run_until_complete(run())
+
+
+@benchmark("process_args[generic]")
+def process_args_generic() -> typing.Callable[[], typing.Any]:
+    return _run_process_args(generic=True)
+
+
+@benchmark("process_args[invoker]")
+def process_args_invoker() -> typing.Callable[[], typing.Any]:
+    return _run_process_args(generic=False)
+
+
+class FakeMessageContext:
+    """The bare minimum of a message context used by parsers."""
+
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+    async def call_with_async_di(self, callback: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        return callback(*args)
+
+
+async def _message_command(
+    ctx: tanjun.abc.MessageContext,
+    text: str,
+    number: int,
+    ratio: float,
+    choice: typing.Literal["foo", "bar"],
+    converted: types.Converted[int] = 0,
+) -> None:
+    """Command with varied arguments."""
+
+
+def _run_message_parser(message_parser: tanjun.abc.MessageParser, calls: int = 1000) -> typing.Callable[[], typing.Any]:
+    context = typing.cast("typing.Any", FakeMessageContext('"hello world" 42 1.5 foo 7'))
+    loop = asyncio.new_event_loop()
+
+    async def run() -> None:
+        for _ in range(calls):
+            await message_parser.parse(context)
+
+    return lambda: loop.run_until_complete(run())
+
+
+@benchmark("message_parser[shlex]")
+def message_parser_shlex() -> typing.Callable[[], typing.Any]:
+    shlex_parser = (
+        tanjun.ShlexParser()
+        .add_argument("text")
+        .add_argument("number", converters=int)
+        .add_argument("ratio", converters=float)
+        .add_argument("choice")
+        .add_argument("converted", converters=int, default=0)
+    )
+    return _run_message_parser(shlex_parser)
+
+
+@benchmark("message_parser[compiled]")
+def message_parser_compiled() -> typing.Callable[[], typing.Any]:
+    command = messages.create_message_command(_message_command)
+    assert command.parser
+    return _run_message_parser(command.parser)
@@ -2,6 +2,99 @@
 
 Finally be able to define your commands without those bloody decorator chains!
 """
-from .autocompletion import *
-from .commands import *
-from .types import *
+
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import (
+        autocompletion,
+        circuits,
+        commands,
+        conversion,
+        deferring,
+        discovery,
+        indexes,
+        invoking,
+        limiting,
+        loadtesting,
+        messages,
+        metrics,
+        parser,
+        profiling,
+        providers,
+        ranking,
+        reloading,
+        slash,
+        startup,
+        types,
+        warming,
+    )
+    from .autocompletion import *
+    from .commands import *
+    from .types import *
+
+__all__ = [
+    "Autocompleted",
+    "Converted",
+    "Mentionable",
+    "Range",
+    "as_autocomplete",
+    "as_message_command",
+    "as_slash_command",
+    "with_autocomplete",
+]
+
+_exports: typing.Mapping[str, str] = {
+    "Autocompleted": "types",
+    "Converted": "types",
+    "Mentionable": "types",
+    "Range": "types",
+    "as_autocomplete": "autocompletion",
+    "as_message_command": "commands",
+    "as_slash_command": "commands",
+    "with_autocomplete": "autocompletion",
+}
+"""Public names and the submodules they are lazily loaded from"""
+
+_submodules = {
+    "autocompletion",
+    "circuits",
+    "commands",
+    "conversion",
+    "deferring",
+    "discovery",
+    "indexes",
+    "invoking",
+    "limiting",
+    "loadtesting",
+    "messages",
+    "metrics",
+    "parser",
+    "profiling",
+    "providers",
+    "ranking",
+    "reloading",
+    "slash",
+    "startup",
+    "types",
+    "warming",
+}
+"""Submodules which are available as attributes"""
+
+
+def __getattr__(name: str) -> typing.Any:
+    # hikari and tanjun are slow to import, only load them once the api is actually used
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+
+    if module_name := _exports.get(name):
+        value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_exports, *_submodules})
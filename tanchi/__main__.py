@@ -0,0 +1,30 @@
+"""Command line tools of tanchi.
+
+python -m tanchi profile bot.commands bot.admin --limit 20
+"""
+import argparse
+import typing
+
+from tanchi import startup
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tanchi", description=__doc__)
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    profile_parser = subparsers.add_parser("profile", help="profile the commands built while importing modules")
+    profile_parser.add_argument("modules", nargs="+", help="modules to import")
+    profile_parser.add_argument("--limit", type=int, default=20, help="amount of rows shown per table")
+    profile_parser.add_argument(
+        "--no-memory", action="store_true", help="don't trace memory, timings are more accurate"
+    )
+
+    args = parser.parse_args(argv)
+
+    report = startup.profile_startup(*args.modules, trace_memory=not args.no_memory)
+    print(report.format(limit=args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
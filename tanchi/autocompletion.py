@@ -1,37 +1,462 @@
+import collections
+import collections.abc
 import functools
 import inspect
+import math
+import time
+import types as builtin_types
 import typing
+import weakref
 
 import hikari
 import tanjun
 
-from tanchi import types
+from tanchi import circuits, limiting, metrics, profiling, ranking, types
 
-__all__ = ["as_autocomplete", "with_autocomplete"]
+__all__ = ["Autocompleter", "ChoicePayload", "Scope", "as_autocomplete", "get_scope", "registered", "with_autocomplete"]
 
-AutocompleteSig = typing.Callable[..., types.MaybeAwaitable[typing.Optional[types.Choices]]]
+MAX_CHOICES = 25
+"""Maximum amount of choices discord accepts"""
 
 
-def as_autocomplete(callback: AutocompleteSig) -> tanjun.abc.AutocompleteCallbackSig:
-    """Convert a callback to an autocomplete callback."""
+def _to_mapping(choices: types.Choices) -> typing.Mapping[str, types.ChoiceValue]:
+    # typing.Sequence's instance check is a lot slower
+    if isinstance(choices, collections.abc.Sequence):
+        return {str(value): value for value in choices}
 
-    @functools.wraps(callback)
-    async def wrapper(context: tanjun.abc.AutocompleteContext, *args: typing.Any, **kwargs: typing.Any) -> None:
-        result = callback(context, *args, **kwargs)
+    return choices
+
+
+_SUBCOMMAND_TYPES = frozenset((hikari.OptionType.SUB_COMMAND, hikari.OptionType.SUB_COMMAND_GROUP))
+
+Scope = typing.Tuple[str, str, typing.Optional[hikari.Snowflake]]
+"""Full command name, option name and guild id an autocompletion is for"""
+
+
+def _command_name(interaction: hikari.AutocompleteInteraction) -> str:
+    """Get the full name of the command of an interaction, including subcommands"""
+    names = [interaction.command_name]
+    options: typing.Optional[typing.Sequence[hikari.AutocompleteInteractionOption]] = interaction.options
+    while options and options[0].type in _SUBCOMMAND_TYPES:
+        names.append(options[0].name)
+        options = options[0].options
+
+    return " ".join(names)
+
+
+def get_scope(context: tanjun.abc.AutocompleteContext) -> Scope:
+    """Get the command, option and guild an autocompletion is for.
+
+    Choices remembered by an autocompleter are only served within the same scope.
+    """
+    return (_command_name(context.interaction), context.focused.name, context.guild_id)
+
+
+def _fallback_key(context: tanjun.abc.AutocompleteContext) -> typing.Tuple[typing.Any, ...]:
+    """Get the key of the choices remembered for an autocompletion.
+
+    Callbacks may depend on the user and on the other options, choices are only served again for the same ones.
+    """
+    focused = context.focused
+    others = tuple((name, option.value) for name, option in context.options.items() if name != focused.name)
+    return (get_scope(context), context.author.id, others, focused.value)
+
+
+def _cache_key(choices: types.Choices) -> typing.Hashable:
+    """Get a key identifying a result, sequences and mappings never compare equal.
+
+    Values are paired with their types since 1, 1.0 and True compare equal but are sent differently.
+    """
+    if isinstance(choices, collections.abc.Sequence):
+        return tuple((type(value), value) for value in choices)
+
+    return (None, *((name, type(value), value) for name, value in choices.items()))
+
+
+_RESPONSE_ATTRIBUTES = ("_has_responded", "_future", "_interaction")
+"""Private attributes of tanjun's autocomplete context used to respond with built choices"""
+
+
+def _can_respond_directly(context: tanjun.abc.AutocompleteContext) -> bool:
+    return isinstance(context, tanjun.context.AutocompleteContext) and all(
+        hasattr(context, name) for name in _RESPONSE_ATTRIBUTES
+    )
+
+
+class ChoicePayload:
+    """Choices which are built only once.
+
+    Autocompleters returning from a fixed set of choices can return the same payload every time.
+    """
+
+    __slots__ = ("_choices", "_mapping")
+
+    def __init__(self, choices: types.Choices) -> None:
+        mapping = _to_mapping(choices)
+        if len(mapping) > MAX_CHOICES:
+            raise ValueError(f"Cannot set more than {MAX_CHOICES} choices")
+
+        self._mapping = builtin_types.MappingProxyType(dict(mapping))
+        # kept as a list like tanjun passes it, it's never exposed mutably
+        self._choices = [hikari.CommandChoice(name=name, value=value) for name, value in mapping.items()]
+
+    def __repr__(self) -> str:
+        return f"ChoicePayload({dict(self._mapping)!r})"
+
+    def __len__(self) -> int:
+        return len(self._choices)
+
+    @property
+    def choices(self) -> typing.Sequence[hikari.CommandChoice]:
+        """The built choices."""
+        return tuple(self._choices)
+
+    @property
+    def mapping(self) -> typing.Mapping[str, types.ChoiceValue]:
+        """The choices as names mapped to values."""
+        return self._mapping
+
+    async def respond(self, context: tanjun.abc.AutocompleteContext) -> None:
+        """Respond to an autocomplete interaction with the choices."""
+        if not _can_respond_directly(context):
+            await context.set_choices(self._mapping)  # type: ignore # choices have to have the same type
+            return
+
+        context = typing.cast("tanjun.context.AutocompleteContext", context)
+        # the same as AutocompleteContext.set_choices without building the choices again,
+        # tanjun gets its own list like it would build
+        if context._has_responded:
+            raise RuntimeError("Cannot set choices after responding")
+
+        context._has_responded = True
+        choices = list(self._choices)
+        if context._future:
+            context._future.set_result(context._interaction.build_response(choices))  # type: ignore # tanjun responds with CommandChoice too
+        else:
+            await context._interaction.create_response(choices)  # type: ignore # tanjun responds with CommandChoice too
+
+
+_EMPTY_PAYLOAD = ChoicePayload(())
+
+AutocompleteSig = typing.Callable[
+    ..., types.MaybeAwaitable[typing.Optional[typing.Union[types.Choices, ChoicePayload]]]
+]
+
+
+class Autocompleter:
+    """An autocomplete callback which may return its choices.
+
+    Returned choices are converted to a `ChoicePayload`, recurring results reuse the converted payload.
+    Contexts other than tanjun's get the choices passed to `set_choices` when nothing else is configured.
+    Precomputed choices are served without calling the callback until they expire, only within their scope.
+    They are served to every user whatever the other options are, so only callbacks declared `context_independent`,
+    whose choices only depend on the command, option, guild and focused value, can have them.
+    Calls shed by a limiter or stopped by a circuit breaker are answered with the last choices for the same value
+    in the same scope, for the same user and values of the other options unless the callback is context independent,
+    or with no choices.
+    How calls were answered is counted in `stats`: "completed" by the callback, "failed" when it raised,
+    "precomputed", "shed" and "broken".
+    With a popularity tracker, returned choices and payloads are ranked by how often they were submitted and cut to 25.
+    """
+
+    callback: AutocompleteSig
+    profiler: typing.Optional[profiling.Profiler]
+    limiter: typing.Optional[limiting.ConcurrencyLimiter]
+    breaker: typing.Optional[circuits.CircuitBreaker]
+    popularity: typing.Optional[ranking.Popularity]
+    context_independent: bool
+    stats: typing.Counter[str]
+
+    def __init__(
+        self,
+        callback: AutocompleteSig,
+        *,
+        profiler: typing.Optional[profiling.Profiler] = None,
+        limiter: typing.Optional[limiting.ConcurrencyLimiter] = None,
+        breaker: typing.Optional[circuits.CircuitBreaker] = None,
+        popularity: typing.Optional[ranking.Popularity] = None,
+        context_independent: bool = False,
+        fallback_size: int = 128,
+        payload_cache_size: int = 256,
+    ) -> None:
+        functools.update_wrapper(self, callback)
+        self.callback = callback
+        self.profiler = profiler
+        self.limiter = limiter
+        self.breaker = breaker
+        self.popularity = popularity
+        self.context_independent = context_independent
+        self.stats = collections.Counter()
+
+        self._fallback_size = fallback_size
+        self._fallbacks: typing.OrderedDict[typing.Tuple[typing.Any, ...], ChoicePayload] = collections.OrderedDict()
+        self._payload_cache_size = payload_cache_size
+        self._payloads: typing.OrderedDict[typing.Hashable, ChoicePayload] = collections.OrderedDict()
+        self._precomputed: typing.Dict[typing.Tuple[Scope, typing.Any], typing.Tuple[float, ChoicePayload]] = {}
+
+    def set_precomputed(
+        self, scope: Scope, value: typing.Any, payload: ChoicePayload, *, ttl: typing.Optional[float]
+    ) -> None:
+        """Serve choices for a focused value in a scope without calling the callback, for `ttl` seconds or forever.
+
+        Raises:
+            ValueError: If the callback isn't context independent.
+        """
+        if not self.context_independent:
+            raise ValueError("Only context independent autocompleters can have precomputed choices")
+
+        expires_at = math.inf if ttl is None else time.monotonic() + ttl
+        self._precomputed[(scope, value)] = (expires_at, payload)
+
+    def clear_precomputed(self) -> None:
+        """Remove all precomputed choices."""
+        self._precomputed.clear()
+
+    def _get_precomputed(self, context: tanjun.abc.AutocompleteContext) -> typing.Optional[ChoicePayload]:
+        key = (get_scope(context), context.focused.value)
+        if (precomputed := self._precomputed.get(key)) is None:
+            return None
+
+        expires_at, payload = precomputed
+        if expires_at <= time.monotonic():
+            del self._precomputed[key]
+            return None
+
+        return payload
+
+    def _fallback_key(self, context: tanjun.abc.AutocompleteContext) -> typing.Tuple[typing.Any, ...]:
+        if self.context_independent:
+            return (get_scope(context), context.focused.value)
+
+        return _fallback_key(context)
+
+    def _remember(self, context: tanjun.abc.AutocompleteContext, payload: ChoicePayload) -> None:
+        key = self._fallback_key(context)
+        self._fallbacks[key] = payload
+        self._fallbacks.move_to_end(key)
+        if len(self._fallbacks) > self._fallback_size:
+            self._fallbacks.popitem(last=False)
+
+    def _get_fallback(self, context: tanjun.abc.AutocompleteContext) -> ChoicePayload:
+        return self._fallbacks.get(self._fallback_key(context), _EMPTY_PAYLOAD)
+
+    def _to_payload(self, choices: types.Choices) -> ChoicePayload:
+        if not self._payload_cache_size:
+            return ChoicePayload(choices)
+
+        key = _cache_key(choices)
+        if (payload := self._payloads.get(key)) is not None:
+            self._payloads.move_to_end(key)
+            return payload
+
+        payload = self._payloads[key] = ChoicePayload(choices)
+        if len(self._payloads) > self._payload_cache_size:
+            self._payloads.popitem(last=False)
+
+        return payload
+
+    def _rank(
+        self, popularity: ranking.Popularity, context: tanjun.abc.AutocompleteContext, choices: types.Choices
+    ) -> ChoicePayload:
+        command = _command_name(context.interaction)
+        return self._to_payload(popularity.rank(command, context.focused.name, choices, limit=MAX_CHOICES))
+
+    async def _complete_directly(
+        self, context: tanjun.abc.AutocompleteContext, *args: typing.Any, **kwargs: typing.Any
+    ) -> None:
+        result = self.callback(context, *args, **kwargs)
         if inspect.isawaitable(result):
             result = await result
 
-        result = typing.cast("typing.Optional[types.Choices]", result)
+        result = typing.cast("typing.Optional[typing.Union[types.Choices, ChoicePayload]]", result)
 
         if result is None or context.has_responded:
             return
 
-        if isinstance(result, typing.Sequence):
-            result = {str(value): value for value in result}
+        if isinstance(result, ChoicePayload):
+            await result.respond(context)
+        elif _can_respond_directly(context):
+            await self._to_payload(result).respond(context)
+        else:
+            # a payload would only be turned back into the mapping
+            await context.set_choices(_to_mapping(result))  # type: ignore # choices have to have the same type
 
-        await context.set_choices(result)  # type: ignore # choices have to have the same type
+    async def complete(self, context: tanjun.abc.AutocompleteContext, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Call the callback and respond with its choices, bypassing limits, metrics and precomputed choices."""
+        await self._complete(context, *args, **kwargs)
 
-    return wrapper
+    async def _complete(self, context: tanjun.abc.AutocompleteContext, *args: typing.Any, **kwargs: typing.Any) -> bool:
+        """Complete an autocompletion, returning whether the callback answered it rather than the breaker."""
+        if self.breaker is None:
+            result = self.callback(context, *args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        else:
+            try:
+                result = await self.breaker.call(self.callback, context, *args, **kwargs)
+            except circuits.CircuitError:
+                self.stats["broken"] += 1
+                if not context.has_responded:
+                    await self._get_fallback(context).respond(context)
+                return False
+
+        result = typing.cast("typing.Optional[typing.Union[types.Choices, ChoicePayload]]", result)
+
+        if result is None or context.has_responded:
+            return True
+
+        if self.popularity is not None:
+            choices = result.mapping if isinstance(result, ChoicePayload) else result
+            payload = self._rank(self.popularity, context, choices)
+        elif isinstance(result, ChoicePayload):
+            payload = result
+        else:
+            payload = self._to_payload(result)
+
+        if self.limiter is not None or self.breaker is not None:
+            self._remember(context, payload)
+
+        await payload.respond(context)
+        return True
+
+    async def _run(
+        self, name: str, context: tanjun.abc.AutocompleteContext, *args: typing.Any, **kwargs: typing.Any
+    ) -> bool:
+        if self.profiler is None:
+            return await self._complete(context, *args, **kwargs)
+
+        return await self.profiler.run(name, self._complete, context, *args, **kwargs)
+
+    async def _shed(self, name: str, context: tanjun.abc.AutocompleteContext) -> None:
+        self.stats["shed"] += 1
+        if sink := metrics.get_sink():
+            sink.record("autocomplete.shed", name, 0.0)
+
+        await self._get_fallback(context).respond(context)
+
+    async def __call__(self, context: tanjun.abc.AutocompleteContext, *args: typing.Any, **kwargs: typing.Any) -> None:
+        sink = metrics.get_sink()
+        if (
+            sink is None
+            and not self._precomputed
+            and self.profiler is None
+            and self.limiter is None
+            and self.breaker is None
+            and self.popularity is None
+        ):
+            try:
+                await self._complete_directly(context, *args, **kwargs)
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+
+            self.stats["completed"] += 1
+            return
+
+        if self._precomputed and (payload := self._get_precomputed(context)) is not None:
+            self.stats["precomputed"] += 1
+            if self.popularity is not None:
+                # counts keep changing after the choices were precomputed
+                payload = self._rank(self.popularity, context, payload.mapping)
+
+            return await payload.respond(context)
+
+        if sink is None and self.profiler is None and self.limiter is None:
+            try:
+                answered = await self._complete(context, *args, **kwargs)
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+
+            if answered:
+                self.stats["completed"] += 1
+            return
+
+        name = f"{_command_name(context.interaction)}.{context.focused.name}"
+
+        if self.limiter is not None and not self.limiter.try_acquire(context):
+            return await self._shed(name, context)
+
+        elapsed = metrics.timer()
+        try:
+            answered = await self._run(name, context, *args, **kwargs)
+        except Exception:
+            self.stats["failed"] += 1
+            if sink:
+                sink.record("autocomplete", name, elapsed(), failed=True)
+            raise
+        finally:
+            if self.limiter is not None:
+                self.limiter.release(context)
+
+        if answered:
+            self.stats["completed"] += 1
+        if sink:
+            sink.record("autocomplete", name, elapsed())
+
+
+_registry: weakref.WeakValueDictionary[typing.Tuple[typing.Any, ...], Autocompleter] = weakref.WeakValueDictionary()
+"""Canonical autocompleters by callback and configuration"""
+
+
+def registered() -> typing.List[Autocompleter]:
+    """Get every canonical autocompleter which is still in use."""
+    return list(_registry.values())
+
+
+def as_autocomplete(
+    callback: AutocompleteSig,
+    *,
+    profiler: typing.Optional[profiling.Profiler] = None,
+    limiter: typing.Optional[limiting.ConcurrencyLimiter] = None,
+    breaker: typing.Optional[circuits.CircuitBreaker] = None,
+    popularity: typing.Optional[ranking.Popularity] = None,
+    context_independent: bool = False,
+) -> tanjun.abc.AutocompleteCallbackSig:
+    """Convert a callback to an autocomplete callback.
+
+    A profiler may be provided to sample slow autocompletions,
+    a limiter to shed calls over a concurrency limit, a breaker to time out calls to a failing backend
+    and a popularity tracker to rank the choices by how often they were submitted.
+    Callbacks whose choices don't depend on the user or the other options can be declared
+    `context_independent`, so their choices can be warmed up and shared by every user.
+
+    The same callback and configuration always give the same autocompleter,
+    so its limits and stats are shared by every option using it. Fallback and precomputed
+    choices are kept per command, option and guild, payloads are shared between equal results.
+    """
+    if (
+        isinstance(callback, Autocompleter)
+        and not context_independent
+        and all(option is None for option in (profiler, limiter, breaker, popularity))
+    ):
+        return callback
+
+    key = (callback, profiler, limiter, breaker, popularity, context_independent)
+    try:
+        autocompleter = _registry.get(key)
+    except TypeError:
+        # unhashable callbacks can't be shared
+        return Autocompleter(
+            callback,
+            profiler=profiler,
+            limiter=limiter,
+            breaker=breaker,
+            popularity=popularity,
+            context_independent=context_independent,
+        )
+
+    if autocompleter is None:
+        autocompleter = _registry[key] = Autocompleter(
+            callback,
+            profiler=profiler,
+            limiter=limiter,
+            breaker=breaker,
+            popularity=popularity,
+            context_independent=context_independent,
+        )
+
+    return autocompleter
 
 
 def add_autocomplete(
@@ -59,11 +484,24 @@ def with_autocomplete(
     command: tanjun.SlashCommand[typing.Any],
     /,
     name: str,
+    *,
+    profiler: typing.Optional[profiling.Profiler] = None,
+    limiter: typing.Optional[limiting.ConcurrencyLimiter] = None,
+    breaker: typing.Optional[circuits.CircuitBreaker] = None,
+    popularity: typing.Optional[ranking.Popularity] = None,
+    context_independent: bool = False,
 ) -> typing.Callable[[AutocompleteSig], tanjun.abc.AutocompleteCallbackSig]:
     """Decorator to add an arbitrary autocomplete to a command."""
 
     def wrapper(callback: AutocompleteSig) -> tanjun.abc.AutocompleteCallbackSig:
-        autocompleter = as_autocomplete(callback)
+        autocompleter = as_autocomplete(
+            callback,
+            profiler=profiler,
+            limiter=limiter,
+            breaker=breaker,
+            popularity=popularity,
+            context_independent=context_independent,
+        )
         add_autocomplete(command, name=name, callback=autocompleter)
         return autocompleter
 
@@ -0,0 +1,193 @@
+"""Timeouts and circuit breakers for converters and autocompleters calling slow backends.
+
+A breaker opens after repeated failures or timeouts and fails fast while it's open.
+After a while it lets trial calls through and closes again once they succeed.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import functools
+import inspect
+import time
+import typing
+
+from . import metrics
+
+__all__ = ["CLOSED", "HALF_OPEN", "OPEN", "CircuitBreaker", "CircuitError", "CircuitOpenError", "CircuitTimeoutError"]
+
+T = typing.TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitError(ValueError):
+    """A call which was not completed because of a breaker.
+
+    It's a ValueError so that tanjun tries the next converter or reports a conversion error.
+    """
+
+
+class CircuitOpenError(CircuitError):
+    """The breaker is open, the call failed fast."""
+
+
+class CircuitTimeoutError(CircuitError):
+    """The call took longer than the timeout."""
+
+
+class CircuitBreaker:
+    """Time out calls and stop calling a failing backend for a while.
+
+    Exceptions of the ignored types, such as the ValueErrors converters raise for invalid input,
+    don't count as failures, nor as successful trial calls. `CircuitError`s of breakers used by the callback
+    are never ignored. Calls which started before the last state transition don't count at all.
+    Only async callbacks can be timed out.
+    State transitions are recorded as "circuit.closed", "circuit.open" and "circuit.half_open" metrics
+    with the time spent in the previous state and counted in `transitions`.
+
+    Args:
+        name: Name of the breaker in metrics.
+        timeout: Seconds a call may take, unlimited if None.
+        failure_threshold: Consecutive failures after which the breaker opens.
+        recovery_time: Seconds the breaker stays open before letting a trial call through.
+        trials: Consecutive successful trial calls needed to close the breaker.
+        ignore: Exception types which don't count as failures.
+    """
+
+    name: str
+    timeout: typing.Optional[float]
+    failure_threshold: int
+    recovery_time: float
+    trials: int
+    ignore: typing.Tuple[typing.Type[BaseException], ...]
+    transitions: typing.Counter[str]
+
+    def __init__(
+        self,
+        name: str = "circuit",
+        *,
+        timeout: typing.Optional[float] = None,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        trials: int = 1,
+        ignore: typing.Tuple[typing.Type[BaseException], ...] = (ValueError,),
+    ) -> None:
+        if failure_threshold < 1 or trials < 1:
+            raise ValueError("The failure threshold and trials must be at least 1")
+
+        self.name = name
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.trials = trials
+        self.ignore = ignore
+        self.transitions = collections.Counter()
+
+        self._state = CLOSED
+        self._changed_at = time.monotonic()
+        self._failures = 0
+        self._successes = 0
+        self._probing = False
+        self._generation = 0
+
+    @property
+    def state(self) -> str:
+        """The current state, an open breaker becomes half open once it may be probed."""
+        if self._state == OPEN and time.monotonic() - self._changed_at >= self.recovery_time:
+            self._transition(HALF_OPEN)
+
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        now = time.monotonic()
+        duration, self._changed_at = now - self._changed_at, now
+        self._state = state
+        self._failures = self._successes = 0
+        self._generation += 1
+        self.transitions[state] += 1
+
+        if sink := metrics.get_sink():
+            sink.record(f"circuit.{state}", self.name, duration)
+
+    def _succeeded(self, generation: int) -> None:
+        # calls which started before a transition say nothing about the current state
+        if generation != self._generation:
+            return
+
+        if self._state == HALF_OPEN:
+            self._successes += 1
+            if self._successes >= self.trials:
+                self._transition(CLOSED)
+        else:
+            self._failures = 0
+
+    def _ignored(self, generation: int) -> None:
+        # the backend answered, but a trial call must succeed to close the breaker
+        if generation == self._generation and self._state == CLOSED:
+            self._failures = 0
+
+    def _failed(self, generation: int) -> None:
+        # calls which started before the breaker opened don't keep it open longer
+        if generation != self._generation:
+            return
+
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._transition(OPEN)
+
+    async def call(
+        self,
+        callback: typing.Callable[..., typing.Union[T, typing.Awaitable[T]]],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> T:
+        """Call a sync or async callback through the breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or another trial call is running.
+            CircuitTimeoutError: If the call took longer than the timeout.
+        """
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probing):
+            raise CircuitOpenError(f"{self.name} is unavailable")
+
+        self._probing = state == HALF_OPEN
+        generation = self._generation
+        try:
+            result = callback(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, self.timeout)
+        except asyncio.TimeoutError:
+            self._failed(generation)
+            raise CircuitTimeoutError(f"{self.name} took too long") from None
+        except CircuitError:
+            # a ValueError, but a backend behind another breaker is failing
+            self._failed(generation)
+            raise
+        except self.ignore:
+            self._ignored(generation)
+            raise
+        except Exception:
+            self._failed(generation)
+            raise
+        finally:
+            if state == HALF_OPEN:
+                self._probing = False
+
+        self._succeeded(generation)
+        return typing.cast("T", result)
+
+    def protect(self, callback: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Awaitable[typing.Any]]:
+        """Wrap a converter to call it through the breaker.
+
+        The wrapper keeps the signature of the converter for dependency injection.
+        """
+
+        @functools.wraps(callback)
+        async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            return await self.call(callback, *args, **kwargs)
+
+        return wrapper
@@ -3,33 +3,59 @@ import typing
 import hikari
 import tanjun
 
-from tanchi import parser, types
+from tanchi import (
+    deferring,
+    messages,
+    parser,
+    profiling,
+    ranking,
+    reloading,
+    slash,
+    types,
+)
 
-__all__ = ["as_slash_command"]
+__all__ = ["as_message_command", "as_slash_command"]
 
 
 def as_slash_command(
     name: typing.Optional[str] = None,
     *,
     always_defer: bool = False,
+    adaptive_defer: typing.Optional[deferring.AdaptiveDefer] = None,
     default_member_permissions: typing.Union[hikari.Permissions, int, None] = None,
     default_to_ephemeral: typing.Optional[bool] = None,
     dm_enabled: typing.Optional[bool] = None,
     is_global: bool = True,
+    popularity: typing.Optional[ranking.Popularity] = None,
+    profiler: typing.Optional[profiling.Profiler] = None,
     sort_options: bool = True,
     validate_arg_keys: bool = True,
     **kwargs: typing.Any,
-) -> typing.Callable[[types.CommandCallbackSigT], tanjun.SlashCommand[types.CommandCallbackSigT]]:
+) -> typing.Callable[[types.CommandCallbackSigT], slash.SlashCommand[types.CommandCallbackSigT]]:
     """Build a SlashCommand by decorating a function."""
-    return lambda func: parser.create_command(
+    return lambda func: reloading.build(
         func,
+        parser.create_command,
         name=name,
         always_defer=always_defer,
+        adaptive_defer=adaptive_defer,
         default_member_permissions=default_member_permissions,
         default_to_ephemeral=default_to_ephemeral,
         dm_enabled=dm_enabled,
         is_global=is_global,
+        popularity=popularity,
+        profiler=profiler,
         sort_options=sort_options,
         validate_arg_keys=validate_arg_keys,
         **kwargs,
     )
+
+
+def as_message_command(
+    name: typing.Optional[str] = None,
+    /,
+    *names: str,
+    validate_arg_keys: bool = True,
+) -> typing.Callable[[types.CommandCallbackSigT], tanjun.MessageCommand[types.CommandCallbackSigT]]:
+    """Build a MessageCommand by decorating a function."""
+    return lambda func: messages.create_message_command(func, name, *names, validate_arg_keys=validate_arg_keys)
@@ -0,0 +1,120 @@
+"""Adaptive deferring of slash commands based on their observed latency."""
+from __future__ import annotations
+
+import collections
+import time
+import typing
+
+import tanjun
+
+from . import metrics
+
+__all__ = ["AdaptiveDefer"]
+
+T = typing.TypeVar("T")
+
+
+class AdaptiveDefer:
+    """Defer commands which are likely to miss the interaction deadline.
+
+    A rolling latency estimate is kept for every command.
+    Commands predicted to be slow are deferred upfront,
+    others are deferred by tanjun's defer timer if they are still running close to the deadline.
+    The timer is only started when the client's auto-defer hasn't already started one.
+
+    Decisions are counted in `decisions` and recorded as "defer.predicted",
+    "defer.watchdog" and "defer.skipped" metrics events, where "defer.watchdog"
+    counts commands which were deferred while they ran.
+
+    Args:
+        threshold: Predicted seconds above which a command is deferred upfront.
+        deadline: Seconds after which a still running command is deferred, without the client's auto-defer.
+        alpha: Weight of the newest observation in the estimate.
+    """
+
+    threshold: float
+    deadline: float
+    alpha: float
+    decisions: typing.Counter[typing.Tuple[str, str]]
+
+    def __init__(self, *, threshold: float = 1.5, deadline: float = 2.5, alpha: float = 0.2) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("Alpha must be between 0 and 1")
+
+        self.threshold = threshold
+        self.deadline = deadline
+        self.alpha = alpha
+        self.decisions = collections.Counter()
+
+        self._estimates: typing.Dict[str, typing.Tuple[float, float]] = {}
+
+    def observe(self, name: str, duration: float) -> None:
+        """Update the latency estimate of a command."""
+        if (estimate := self._estimates.get(name)) is None:
+            self._estimates[name] = (duration, duration / 2)
+            return
+
+        mean, deviation = estimate
+        deviation += self.alpha * (abs(duration - mean) - deviation)
+        mean += self.alpha * (duration - mean)
+        self._estimates[name] = (mean, deviation)
+
+    def predict(self, name: str) -> typing.Optional[float]:
+        """Predict a pessimistic latency of a command, None if it has never been observed."""
+        if (estimate := self._estimates.get(name)) is None:
+            return None
+
+        mean, deviation = estimate
+        return mean + 2 * deviation
+
+    def _decide(self, name: str, decision: str, duration: float) -> None:
+        self.decisions[(name, decision)] += 1
+        if sink := metrics.get_sink():
+            sink.record(f"defer.{decision}", name, duration)
+
+    def _start_timer(self, ctx: tanjun.abc.SlashContext) -> bool:
+        """Start tanjun's defer timer, False if it couldn't be started"""
+        if not isinstance(ctx, tanjun.context.SlashContext):
+            return False
+
+        try:
+            ctx.start_defer_timer(self.deadline)
+        except RuntimeError:
+            # the client's auto-defer timer is already running
+            return False
+
+        return True
+
+    async def run(
+        self,
+        name: str,
+        ctx: tanjun.abc.SlashContext,
+        callback: typing.Callable[..., typing.Awaitable[T]],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> T:
+        """Run a command, deferring it if needed."""
+        if ctx.has_responded or ctx.has_been_deferred:
+            return await callback(*args, **kwargs)
+
+        start = time.perf_counter()
+        if (predicted := self.predict(name)) is not None and predicted >= self.threshold:
+            await ctx.defer()
+            self._decide(name, "predicted", predicted)
+            try:
+                return await callback(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start)
+
+        started = self._start_timer(ctx)
+        try:
+            return await callback(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(name, duration)
+
+            # cancelling a timer which is already sending its defer would leave the interaction in an unknown state
+            if started and not ctx.has_been_deferred:
+                typing.cast("tanjun.context.SlashContext", ctx).cancel_defer()
+
+            self._decide(name, "watchdog" if ctx.has_been_deferred else "skipped", duration)
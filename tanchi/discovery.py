@@ -0,0 +1,242 @@
+"""Discovery of slash commands by reading source files instead of importing them.
+
+Scanning a file parses it and looks for functions decorated with `as_slash_command`,
+none of the modules are imported until their commands are actually needed.
+"""
+from __future__ import annotations
+
+import ast
+import dataclasses
+import importlib
+import json
+import os
+import pathlib
+import typing
+
+if typing.TYPE_CHECKING:
+    import tanjun
+
+__all__ = ["CommandLocation", "Manifest", "module_name", "scan_file", "scan_source"]
+
+_DECORATOR_PATHS = {("tanchi", "as_slash_command"), ("tanchi", "commands", "as_slash_command")}
+"""Fully qualified names of the decorator"""
+
+_CACHE_VERSION = 1
+
+
+@dataclasses.dataclass(frozen=True)
+class CommandLocation:
+    """Where a slash command is declared.
+
+    The name is None if it isn't a literal and can only be known by importing the module.
+    """
+
+    name: typing.Optional[str]
+    function: str
+    module: str
+    path: str
+    lineno: int
+
+
+def module_name(path: typing.Union[str, pathlib.Path], root: typing.Union[str, pathlib.Path]) -> str:
+    """Get the name of the module a file is imported as, relative to a directory on the import path."""
+    parts = list(pathlib.Path(path).resolve().relative_to(pathlib.Path(root).resolve()).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+
+    return ".".join(parts)
+
+
+def _aliases(tree: ast.Module) -> typing.Dict[str, typing.Tuple[str, ...]]:
+    """Map names bound by imports of tanchi to what they refer to"""
+    aliases: typing.Dict[str, typing.Tuple[str, ...]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == "tanchi" or alias.name.startswith("tanchi."):
+                    if alias.asname:
+                        aliases[alias.asname] = tuple(alias.name.split("."))
+                    else:
+                        aliases["tanchi"] = ("tanchi",)
+
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            if node.module == "tanchi" or node.module.startswith("tanchi."):
+                for alias in node.names:
+                    aliases[alias.asname or alias.name] = (*node.module.split("."), alias.name)
+
+    return aliases
+
+
+def _qualified_name(node: ast.expr, aliases: typing.Mapping[str, typing.Tuple[str, ...]]) -> typing.Tuple[str, ...]:
+    attributes: typing.List[str] = []
+    while isinstance(node, ast.Attribute):
+        attributes.append(node.attr)
+        node = node.value
+
+    if not isinstance(node, ast.Name) or node.id not in aliases:
+        return ()
+
+    return (*aliases[node.id], *reversed(attributes))
+
+
+def _command_name(decorator: ast.expr, function: str) -> typing.Optional[str]:
+    """Get the name given to a command by its decorator, None if it isn't a literal"""
+    if not isinstance(decorator, ast.Call):
+        return function
+
+    name: typing.Optional[ast.expr] = decorator.args[0] if decorator.args else None
+    for keyword in decorator.keywords:
+        if keyword.arg == "name":
+            name = keyword.value
+
+    if name is None or (isinstance(name, ast.Constant) and name.value is None):
+        return function
+    if isinstance(name, ast.Constant) and isinstance(name.value, str):
+        return name.value
+
+    return None
+
+
+def scan_source(source: str, module: str, path: str = "<unknown>") -> typing.List[CommandLocation]:
+    """Find the slash commands declared in source code."""
+    tree = ast.parse(source, path)
+    if not (aliases := _aliases(tree)):
+        return []
+
+    locations: typing.List[CommandLocation] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if _qualified_name(target, aliases) in _DECORATOR_PATHS:
+                name = _command_name(decorator, node.name)
+                locations.append(CommandLocation(name, node.name, module, path, node.lineno))
+
+    return locations
+
+
+def scan_file(path: typing.Union[str, pathlib.Path], module: str) -> typing.List[CommandLocation]:
+    """Find the slash commands declared in a file."""
+    with open(path, "rb") as file:
+        return scan_source(file.read().decode("utf-8"), module, str(path))
+
+
+class Manifest:
+    """Locations of the slash commands below a directory, cached by the modification time of every file.
+
+    Args:
+        cache: File the scanned locations are kept in between runs.
+    """
+
+    cache: typing.Optional[pathlib.Path]
+
+    def __init__(self, cache: typing.Union[str, pathlib.Path, None] = None) -> None:
+        self.cache = pathlib.Path(cache) if cache is not None else None
+        self._files: typing.Dict[str, typing.Tuple[int, int, typing.List[CommandLocation]]] = {}
+        self._loaded = False
+
+    @property
+    def commands(self) -> typing.Sequence[CommandLocation]:
+        """Every command found, in the order of their files."""
+        return [location for *_, locations in self._files.values() for location in locations]
+
+    def _load_cache(self) -> None:
+        self._loaded = True
+        if self.cache is None or not self.cache.exists():
+            return
+
+        data = json.loads(self.cache.read_text("utf-8"))
+        if data.get("version") != _CACHE_VERSION:
+            return
+
+        for path, (mtime, size, locations) in data["files"].items():
+            self._files[path] = (mtime, size, [CommandLocation(**location) for location in locations])
+
+    def _save_cache(self) -> None:
+        if self.cache is None:
+            return
+
+        files = {
+            path: (mtime, size, [dataclasses.asdict(location) for location in locations])
+            for path, (mtime, size, locations) in self._files.items()
+        }
+        self.cache.write_text(json.dumps({"version": _CACHE_VERSION, "files": files}), "utf-8")
+
+    def scan(self, root: typing.Union[str, pathlib.Path], *, exclude: typing.Collection[str] = ()) -> Manifest:
+        """Scan every python file below a directory on the import path, reusing the results of unchanged files.
+
+        Directories starting with a dot, `__pycache__` and the excluded directory names are skipped.
+        """
+        if not self._loaded:
+            self._load_cache()
+
+        root = pathlib.Path(root)
+        changed = False
+        seen: typing.Set[str] = set()
+
+        for directory, directories, files in os.walk(root):
+            directories[:] = sorted(
+                name
+                for name in directories
+                if not name.startswith(".") and name != "__pycache__" and name not in exclude
+            )
+            for file in sorted(files):
+                if not file.endswith(".py"):
+                    continue
+
+                path = str(pathlib.Path(directory, file).resolve())
+                seen.add(path)
+                stat = os.stat(path)
+
+                if (cached := self._files.get(path)) and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                try:
+                    locations = scan_file(path, module_name(path, root))
+                except (SyntaxError, UnicodeDecodeError):
+                    locations = []
+
+                self._files[path] = (stat.st_mtime_ns, stat.st_size, locations)
+                changed = True
+
+        resolved_root = str(root.resolve())
+        for path in [path for path in self._files if path.startswith(resolved_root + os.sep) and path not in seen]:
+            del self._files[path]
+            changed = True
+
+        if changed:
+            self._save_cache()
+
+        return self
+
+    def modules_for(self, names: typing.Iterable[str]) -> typing.List[str]:
+        """Get the modules declaring commands.
+
+        Modules with commands whose names aren't literals are always included.
+        """
+        names = set(names)
+        modules: typing.Dict[str, None] = {}
+        for location in self.commands:
+            if location.name is None or location.name in names:
+                modules[location.module] = None
+
+        return list(modules)
+
+    def import_commands(self, names: typing.Iterable[str]) -> typing.Dict[str, tanjun.abc.BaseSlashCommand]:
+        """Import only the modules declaring commands and get the commands by name."""
+        from . import slash
+
+        names = set(names)
+        commands: typing.Dict[str, tanjun.abc.BaseSlashCommand] = {}
+        for name in self.modules_for(names):
+            module = importlib.import_module(name)
+            for value in vars(module).values():
+                if isinstance(value, slash.SlashCommand) and value.name in names:
+                    commands[value.name] = value
+
+        if missing := names - commands.keys():
+            raise LookupError(f"Commands not found: {', '.join(sorted(missing))}")
+
+        return commands
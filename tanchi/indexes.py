@@ -0,0 +1,146 @@
+"""Read-only choice indexes shared between processes through memory-mapped files.
+
+An index file holds the case-folded keys of its choices in sorted order, packed into a single buffer
+and addressed by an array of offsets, the choices themselves are packed the same way.
+Every process mapping the same file shares its pages through the OS page cache.
+"""
+from __future__ import annotations
+
+import array
+import mmap
+import os
+import struct
+import typing
+
+__all__ = ["ChoiceIndex", "build_index"]
+
+_MAGIC = b"TNCI"
+_VERSION = 1
+_HEADER = struct.Struct("=4sII")
+"""Magic, version and amount of choices"""
+_OFFSET_TYPE: typing.Final = "I"
+
+
+def build_index(choices: typing.Iterable[str], path: typing.Union[str, os.PathLike[str]]) -> None:
+    """Write an index of choices to a file.
+
+    Duplicate choices are removed. The file is replaced atomically,
+    processes which mapped it before keep the old index.
+    """
+    entries = sorted((choice.casefold().encode(), choice.encode()) for choice in dict.fromkeys(choices))
+
+    key_offsets = array.array(_OFFSET_TYPE, [0])
+    choice_offsets = array.array(_OFFSET_TYPE, [0])
+    for key, choice in entries:
+        key_offsets.append(key_offsets[-1] + len(key))
+        choice_offsets.append(choice_offsets[-1] + len(choice))
+
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(entries)))
+        key_offsets.tofile(file)
+        choice_offsets.tofile(file)
+        file.writelines(key for key, _ in entries)
+        file.writelines(choice for _, choice in entries)
+
+    os.replace(temporary, path)
+
+
+class ChoiceIndex:
+    """A memory-mapped index of choices searched by case-insensitive prefix.
+
+    The index can be used as an autocomplete callback, `Autocompleted[index]`.
+
+    Args:
+        path: File written by `build_index`.
+        limit: Maximum amount of choices returned by a search.
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "_choice_offsets",
+        "_choices_start",
+        "_count",
+        "_key_offsets",
+        "_keys_start",
+        "_map",
+        "limit",
+    )
+
+    limit: int
+
+    def __init__(self, path: typing.Union[str, os.PathLike[str]], *, limit: int = 25) -> None:
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"{os.fspath(path)!r} is not a choice index")
+
+        self.limit = limit
+        self._count = count
+
+        itemsize = array.array(_OFFSET_TYPE).itemsize
+        offsets_size = (count + 1) * itemsize
+        view = memoryview(self._map)
+        self._key_offsets = view[_HEADER.size : _HEADER.size + offsets_size].cast(_OFFSET_TYPE)
+        self._choice_offsets = view[_HEADER.size + offsets_size : _HEADER.size + 2 * offsets_size].cast(_OFFSET_TYPE)
+        self._keys_start = _HEADER.size + 2 * offsets_size
+        self._choices_start = self._keys_start + self._key_offsets[count]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self._count:
+            raise IndexError("Choice index out of range")
+
+        start = self._choices_start
+        return self._map[start + self._choice_offsets[index] : start + self._choice_offsets[index + 1]].decode()
+
+    def __enter__(self) -> ChoiceIndex:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def __call__(self, context: typing.Any, value: typing.Any) -> typing.List[str]:
+        return self.search(str(value))
+
+    def _key(self, index: int, length: int) -> bytes:
+        """Get the first `length` bytes of a key"""
+        start = self._keys_start + self._key_offsets[index]
+        return self._map[start : min(start + length, self._keys_start + self._key_offsets[index + 1])]
+
+    def _bisect(self, prefix: bytes) -> int:
+        """Get the index of the first key which is not less than a prefix"""
+        low, high = 0, self._count
+        length = len(prefix)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle, length) < prefix:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def search(self, prefix: str, *, limit: typing.Optional[int] = None) -> typing.List[str]:
+        """Get the choices whose case-folded form starts with the case-folded prefix."""
+        limit = self.limit if limit is None else limit
+        key = prefix.casefold().encode()
+
+        results: typing.List[str] = []
+        index = self._bisect(key)
+        while index < self._count and len(results) < limit and self._key(index, len(key)) == key:
+            results.append(self[index])
+            index += 1
+
+        return results
+
+    def close(self) -> None:
+        """Unmap the index."""
+        self._key_offsets.release()
+        self._choice_offsets.release()
+        self._map.close()
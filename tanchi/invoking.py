@@ -0,0 +1,105 @@
+"""Code generation of specialized argument processing for slash commands.
+
+Tanjun processes the options of every command in a generic loop.
+Since tanchi knows the exact options of a command, it can generate a function
+which does the same work with every branch, default and converter resolved upfront.
+"""
+from __future__ import annotations
+
+import typing
+
+import hikari
+import tanjun
+
+from . import metrics, types
+
+if typing.TYPE_CHECKING:
+    from . import parser
+
+__all__ = ["InvokerSig", "build_invoker"]
+
+InvokerSig = typing.Callable[
+    [tanjun.abc.SlashContext, typing.Mapping[str, typing.Any]], typing.Awaitable[typing.Mapping[str, typing.Any]]
+]
+"""Signature of an invoker, takes the context and the tracked options of the command"""
+
+_resolvers: typing.Mapping[hikari.OptionType, str] = {
+    hikari.OptionType.USER: "option.resolve_to_user()",
+    hikari.OptionType.CHANNEL: "option.resolve_to_channel()",
+    hikari.OptionType.ROLE: "option.resolve_to_role()",
+    hikari.OptionType.MENTIONABLE: "option.resolve_to_mentionable()",
+    hikari.OptionType.ATTACHMENT: "option.resolve_to_attachment()",
+}
+"""Expressions resolving an option of a discord type"""
+
+
+def _generate_option(index: int, option: parser.Option, namespace: typing.Dict[str, typing.Any]) -> typing.List[str]:
+    """Generate the statements assigning the value of an option to v{index}"""
+    name, variable = repr(option.name), f"v{index}"
+    option_type = hikari.OptionType(option.option_type)
+
+    lines = [f"if (option := options.get({name})) is None:"]
+    if option.default is types.UNDEFINED_DEFAULT:
+        message = f"Required option {option.name} is missing data, are you sure your commands are up to date?"
+        lines.append(f"    raise RuntimeError({message!r})")
+    else:
+        namespace[f"d{index}"] = option.default
+        lines.append(f"    {variable} = d{index}")
+
+    lines.append("else:")
+
+    if option_type is hikari.OptionType.USER and option.only_member:
+        lines += [
+            f"    if ({variable} := option.resolve_to_member(default=None)) is None:",
+            f"        raise ConversionError(f'Couldn\\'t find member for provided user: {{option.value}}', {name})",
+        ]
+
+    elif expression := _resolvers.get(option_type):
+        lines.append(f"    {variable} = {expression}")
+
+    elif not option.converters:
+        always_float = option_type is hikari.OptionType.FLOAT and option.always_float
+        lines.append(f"    {variable} = float(option.value)" if always_float else f"    {variable} = option.value")
+
+    elif len(option.converters) == 1:
+        namespace[f"c{index}"] = option.converters[0]
+        message = f"Couldn't convert {option_type} '{option.name}'"
+        lines += [
+            "    if sink is None:",
+            "        try:",
+            f"            {variable} = await ctx.call_with_async_di(c{index}, option.value)",
+            "        except ValueError as exc:",
+            f"            raise ConversionError({message!r}, {name}, errors=[exc])",
+            # the tracked option records the latency of its converters
+            "    else:",
+            f"        {variable} = await tracked_options[{name}].convert(ctx, option.value)",
+        ]
+
+    else:
+        # the tracked option already implements trying every converter
+        lines.append(f"    {variable} = await tracked_options[{name}].convert(ctx, option.value)")
+
+    return lines
+
+
+def build_invoker(options: typing.Sequence[parser.Option]) -> InvokerSig:
+    """Build a function processing the options of a command into keyword arguments."""
+    namespace: typing.Dict[str, typing.Any] = {"ConversionError": tanjun.ConversionError, "get_sink": metrics.get_sink}
+    body = ["options = ctx.options", "sink = get_sink()"]
+    keys: typing.List[str] = []
+
+    for index, option in enumerate(options):
+        if not option.pass_as_kwarg:
+            continue
+
+        body += _generate_option(index, option, namespace)
+        keys.append(f"{option.key or option.name!r}: v{index}")
+
+    body.append(f"return {{{', '.join(keys)}}}")
+
+    source = "async def invoke(ctx, tracked_options):\n" + "\n".join(f"    {line}" for line in body)
+    exec(compile(source, "<tanchi invoker>", "exec"), namespace)
+
+    invoker = namespace["invoke"]
+    invoker.__source__ = source
+    return typing.cast("InvokerSig", invoker)
@@ -0,0 +1,86 @@
+"""Concurrency limits for autocompleters."""
+from __future__ import annotations
+
+import collections
+import typing
+
+import hikari
+import tanjun
+
+__all__ = ["ConcurrencyLimiter"]
+
+AnyContext = typing.Union[tanjun.abc.Context, tanjun.abc.AutocompleteContext]
+
+
+class ConcurrencyLimiter:
+    """Limit the amount of concurrently running calls.
+
+    Calls over the limit are not queued, they are shed and counted in `shed`.
+    Every limit is optional, a limiter used by a single autocompleter limits it as a whole.
+
+    Args:
+        total: Maximum concurrent calls overall.
+        per_guild: Maximum concurrent calls from a single guild.
+        per_user: Maximum concurrent calls from a single user.
+    """
+
+    total: typing.Optional[int]
+    per_guild: typing.Optional[int]
+    per_user: typing.Optional[int]
+    shed: typing.Counter[str]
+
+    def __init__(
+        self,
+        *,
+        total: typing.Optional[int] = None,
+        per_guild: typing.Optional[int] = None,
+        per_user: typing.Optional[int] = None,
+    ) -> None:
+        self.total = total
+        self.per_guild = per_guild
+        self.per_user = per_user
+        self.shed = collections.Counter()
+
+        self._active = 0
+        self._active_guilds: typing.Counter[hikari.Snowflake] = collections.Counter()
+        self._active_users: typing.Counter[hikari.Snowflake] = collections.Counter()
+
+    @property
+    def active(self) -> int:
+        """Amount of currently running calls."""
+        return self._active
+
+    def _limited(self, context: AnyContext) -> typing.Optional[str]:
+        """Get the scope whose limit has been reached"""
+        if self.total is not None and self._active >= self.total:
+            return "total"
+        if self.per_guild is not None and context.guild_id and self._active_guilds[context.guild_id] >= self.per_guild:
+            return "guild"
+        if self.per_user is not None and self._active_users[context.author.id] >= self.per_user:
+            return "user"
+
+        return None
+
+    def try_acquire(self, context: AnyContext) -> bool:
+        """Try to start a call, returns False if it has been shed."""
+        if scope := self._limited(context):
+            self.shed[scope] += 1
+            return False
+
+        self._active += 1
+        if context.guild_id:
+            self._active_guilds[context.guild_id] += 1
+        self._active_users[context.author.id] += 1
+        return True
+
+    def release(self, context: AnyContext) -> None:
+        """Finish a call started with try_acquire."""
+        self._active -= 1
+
+        for counter, key in ((self._active_guilds, context.guild_id), (self._active_users, context.author.id)):
+            if key is None:
+                continue
+
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
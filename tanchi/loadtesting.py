@@ -0,0 +1,406 @@
+"""Load testing of slash commands without discord.
+
+Synthetic or recorded interactions are replayed at a target rate against tanjun's own contexts,
+which respond through fake interactions to a fake REST client.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import datetime
+import itertools
+import json
+import pathlib
+import random
+import string
+import typing
+
+import hikari
+import tanjun
+
+from . import metrics
+
+__all__ = ["FakeRest", "Interaction", "LoadReport", "dump_interactions", "load_interactions", "run_load", "synthesize"]
+
+_RESOLVED_TYPES = {
+    hikari.OptionType.USER,
+    hikari.OptionType.CHANNEL,
+    hikari.OptionType.ROLE,
+    hikari.OptionType.MENTIONABLE,
+    hikari.OptionType.ATTACHMENT,
+}
+"""Option types whose values are ids of resolved objects"""
+
+
+@dataclasses.dataclass(frozen=True)
+class Interaction:
+    """A slash or autocomplete interaction to replay.
+
+    Autocomplete interactions have a focused option.
+    """
+
+    command: str
+    options: typing.Mapping[str, typing.Any]
+    focused: typing.Optional[str] = None
+    guild_id: typing.Optional[int] = None
+    user_id: int = 1
+
+
+def load_interactions(path: typing.Union[str, pathlib.Path]) -> typing.List[Interaction]:
+    """Load interactions recorded as json lines."""
+    with open(path, encoding="utf-8") as file:
+        return [Interaction(**json.loads(line)) for line in file if line.strip()]
+
+
+def dump_interactions(interactions: typing.Iterable[Interaction], path: typing.Union[str, pathlib.Path]) -> None:
+    """Record interactions as json lines."""
+    with open(path, "w", encoding="utf-8") as file:
+        for interaction in interactions:
+            file.write(json.dumps(dataclasses.asdict(interaction)) + "\n")
+
+
+def _random_value(option: hikari.CommandOption, rng: random.Random) -> typing.Any:
+    if option.choices:
+        return rng.choice(option.choices).value
+
+    if option.type is hikari.OptionType.STRING:
+        length = rng.randint(option.min_length or 1, min(option.max_length or 12, 12))
+        return "".join(rng.choices(string.ascii_lowercase, k=length))
+    if option.type is hikari.OptionType.INTEGER:
+        return rng.randint(int(option.min_value or 0), int(option.max_value or 1000))
+    if option.type is hikari.OptionType.FLOAT:
+        return rng.uniform(option.min_value or 0.0, option.max_value or 1000.0)
+    if option.type is hikari.OptionType.BOOLEAN:
+        return rng.random() < 0.5
+
+    return rng.randint(10**17, 10**18)
+
+
+def synthesize(
+    commands: typing.Sequence[tanjun.abc.SlashCommand[typing.Any]],
+    count: int,
+    *,
+    autocomplete_ratio: float = 0.5,
+    seed: typing.Optional[int] = None,
+) -> typing.List[Interaction]:
+    """Generate random interactions for commands.
+
+    Optional options are left out half of the time and focused values are short prefixes,
+    like the first keystrokes of a user.
+    """
+    rng = random.Random(seed)
+    interactions: typing.List[Interaction] = []
+
+    for _ in range(count):
+        command = rng.choice(commands)
+        options = command.build().options
+        autocompleted = [option for option in options if option.autocomplete]
+
+        values = {
+            option.name: _random_value(option, rng) for option in options if option.is_required or rng.random() < 0.5
+        }
+        guild_id = rng.choice((None, rng.randint(1, 100)))
+
+        if autocompleted and rng.random() < autocomplete_ratio:
+            focused = rng.choice(autocompleted)
+            value = _random_value(focused, rng)
+            values[focused.name] = value[: rng.randint(0, 3)] if isinstance(value, str) else value
+            interactions.append(Interaction(command.name, values, focused.name, guild_id, rng.randint(1, 1000)))
+        else:
+            interactions.append(Interaction(command.name, values, None, guild_id, rng.randint(1, 1000)))
+
+    return interactions
+
+
+class FakeRest:
+    """Count the requests made while responding, optionally taking some time for each.
+
+    Args:
+        latency: Seconds every request takes.
+    """
+
+    latency: float
+    calls: typing.Counter[str]
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.calls = collections.Counter()
+
+    async def request(self, route: str) -> None:
+        """Make a request."""
+        self.calls[route] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class _FakeEntity:
+    """Stands in for every resolved object"""
+
+    __slots__ = ("id", "type")
+
+    def __init__(self, id: hikari.Snowflake, type: typing.Optional[hikari.ChannelType] = None) -> None:
+        self.id = id
+        self.type = type
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+class _FakeResolved:
+    __slots__ = ("attachments", "channels", "members", "messages", "roles", "users")
+
+    def __init__(self) -> None:
+        self.attachments: typing.Dict[hikari.Snowflake, _FakeEntity] = {}
+        self.channels: typing.Dict[hikari.Snowflake, _FakeEntity] = {}
+        self.members: typing.Dict[hikari.Snowflake, _FakeEntity] = {}
+        self.messages: typing.Dict[hikari.Snowflake, _FakeEntity] = {}
+        self.roles: typing.Dict[hikari.Snowflake, _FakeEntity] = {}
+        self.users: typing.Dict[hikari.Snowflake, _FakeEntity] = {}
+
+    def add(self, option: hikari.CommandOption, id: hikari.Snowflake) -> None:
+        if option.type is hikari.OptionType.CHANNEL:
+            channel_types = option.channel_types or (hikari.ChannelType.GUILD_TEXT,)
+            self.channels[id] = _FakeEntity(id, hikari.ChannelType(channel_types[0]))
+        elif option.type is hikari.OptionType.ROLE:
+            self.roles[id] = _FakeEntity(id)
+        elif option.type is hikari.OptionType.ATTACHMENT:
+            self.attachments[id] = _FakeEntity(id)
+        else:
+            self.users[id] = self.members[id] = _FakeEntity(id)
+
+
+class _FakeInteraction:
+    """The parts of command and autocomplete interactions used by tanjun's contexts"""
+
+    def __init__(
+        self,
+        rest: FakeRest,
+        interaction: Interaction,
+        options: typing.Sequence[typing.Any],
+        resolved: typing.Optional[_FakeResolved],
+    ) -> None:
+        self._rest = rest
+        self.id = hikari.Snowflake(1)
+        self.command_name = interaction.command
+        self.guild_id = interaction.guild_id and hikari.Snowflake(interaction.guild_id)
+        self.channel_id = hikari.Snowflake(1)
+        self.user = _FakeEntity(hikari.Snowflake(interaction.user_id))
+        self.member = self.user if self.guild_id else None
+        self.created_at = datetime.datetime.now(tz=datetime.timezone.utc)
+        self.options = options
+        self.resolved = resolved
+
+    async def _message(self, route: str) -> _FakeEntity:
+        await self._rest.request(route)
+        return _FakeEntity(hikari.Snowflake(1))
+
+    async def create_response(self, choices: typing.Any) -> None:
+        await self._rest.request("create_autocomplete_response")
+
+    async def create_initial_response(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        await self._rest.request("create_initial_response")
+
+    async def edit_initial_response(self, *args: typing.Any, **kwargs: typing.Any) -> _FakeEntity:
+        return await self._message("edit_initial_response")
+
+    async def fetch_initial_response(self) -> _FakeEntity:
+        return await self._message("fetch_initial_response")
+
+    async def delete_initial_response(self) -> None:
+        await self._rest.request("delete_initial_response")
+
+    async def execute(self, *args: typing.Any, **kwargs: typing.Any) -> _FakeEntity:
+        return await self._message("execute")
+
+    async def edit_message(self, *args: typing.Any, **kwargs: typing.Any) -> _FakeEntity:
+        return await self._message("edit_message")
+
+    async def fetch_message(self, *args: typing.Any, **kwargs: typing.Any) -> _FakeEntity:
+        return await self._message("fetch_message")
+
+    async def delete_message(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        await self._rest.request("delete_message")
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadReport:
+    """Outcome of a load test.
+
+    Histograms are keyed by event and name: "load.slash" per command, "load.autocomplete" per option,
+    "loop.lag" and every metric tanchi recorded during the run.
+    """
+
+    sent: int
+    failed: int
+    duration: float
+    histograms: typing.Mapping[typing.Tuple[str, str], metrics.Histogram]
+    rest_calls: typing.Mapping[str, int]
+
+    @property
+    def throughput(self) -> float:
+        """Completed interactions per second."""
+        return self.sent / self.duration if self.duration else 0.0
+
+    def format(self) -> str:
+        """Format the report as a table."""
+        lines = [
+            f"{self.sent} interactions ({self.failed} failed) in {self.duration:.2f}s, " f"{self.throughput:.1f}/s",
+            f"{'event':<20} {'name':<30} {'count':>8} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}",
+        ]
+        for (event, name), histogram in sorted(self.histograms.items()):
+            lines.append(
+                f"{event:<20} {name:<30} {histogram.count:>8} "
+                + " ".join(
+                    f"{value * 1000:>10.3f}"
+                    for value in (
+                        histogram.percentile(50),
+                        histogram.percentile(90),
+                        histogram.percentile(99),
+                        histogram.max,
+                    )
+                )
+            )
+
+        return "\n".join(lines)
+
+
+class _Runner:
+    def __init__(
+        self,
+        commands: typing.Sequence[tanjun.abc.SlashCommand[typing.Any]],
+        client: tanjun.abc.Client,
+        rest: FakeRest,
+        sink: metrics.HistogramSink,
+    ) -> None:
+        self.commands = {command.name: command for command in commands}
+        self.options = {
+            command.name: {option.name: option for option in command.build().options} for command in commands
+        }
+        self.client = client
+        self.rest = rest
+        self.sink = sink
+        self.failed = 0
+        self.tasks: typing.Set[asyncio.Task[typing.Any]] = set()
+
+    def register(self, task: asyncio.Task[typing.Any]) -> None:
+        """Keep track of a task until it's done"""
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def _build_options(
+        self, interaction: Interaction
+    ) -> typing.Tuple[typing.List[typing.Any], typing.Optional[_FakeResolved]]:
+        declared = self.options[interaction.command]
+        options: typing.List[typing.Any] = []
+        resolved = None
+
+        for name, value in interaction.options.items():
+            option = declared[name]
+            if option.type in _RESOLVED_TYPES:
+                value = hikari.Snowflake(value)
+                resolved = resolved or _FakeResolved()
+                resolved.add(option, value)
+
+            if interaction.focused is None:
+                options.append(hikari.CommandInteractionOption(name=name, type=option.type, value=value, options=None))
+            else:
+                options.append(
+                    hikari.AutocompleteInteractionOption(
+                        name=name, type=option.type, value=value, options=None, is_focused=name == interaction.focused
+                    )
+                )
+
+        return options, resolved
+
+    async def dispatch(self, interaction: Interaction, scheduled: float) -> None:
+        loop = asyncio.get_running_loop()
+        command = self.commands[interaction.command]
+        options, resolved = self._build_options(interaction)
+        fake = typing.cast("typing.Any", _FakeInteraction(self.rest, interaction, options, resolved))
+        client = typing.cast("tanjun.Client", self.client)
+        failed = False
+
+        if interaction.focused is None:
+            event, name = "load.slash", interaction.command
+        else:
+            event, name = "load.autocomplete", f"{interaction.command}.{interaction.focused}"
+
+        try:
+            if interaction.focused is None:
+                await command.execute(tanjun.context.SlashContext(client, fake, self.register))
+            else:
+                await command.execute_autocomplete(tanjun.context.AutocompleteContext(client, fake))
+        except Exception:
+            failed = True
+            self.failed += 1
+
+        self.sink.record(event, name, loop.time() - scheduled, failed=failed)
+
+    async def monitor(self, interval: float) -> None:
+        """Record how late the event loop wakes up"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.sink.record("loop.lag", "loop", max(loop.time() - expected, 0.0))
+
+
+async def run_load(
+    commands: typing.Sequence[tanjun.abc.SlashCommand[typing.Any]],
+    interactions: typing.Sequence[Interaction],
+    *,
+    rate: float,
+    total: typing.Optional[int] = None,
+    client: typing.Optional[tanjun.abc.Client] = None,
+    rest: typing.Optional[FakeRest] = None,
+    lag_interval: float = 0.01,
+) -> LoadReport:
+    """Replay interactions against commands at a target rate.
+
+    Interactions are started on schedule whether or not earlier ones finished,
+    latencies are measured from the scheduled start.
+
+    Args:
+        commands: Commands the interactions are dispatched to.
+        interactions: Interactions replayed in order, repeated until `total` were sent.
+        rate: Interactions started per second.
+        total: Amount of interactions sent, defaults to the amount of interactions.
+        client: Client providing dependencies, defaults to a client without any.
+        rest: Fake REST client responses are sent to.
+        lag_interval: Seconds between event loop lag measurements.
+    """
+    if not interactions:
+        raise ValueError("At least one interaction is required")
+
+    loop = asyncio.get_running_loop()
+    rest = rest or FakeRest()
+    sink = metrics.HistogramSink()
+    runner = _Runner(commands, client or tanjun.Client(typing.cast("typing.Any", rest)), rest, sink)
+    total = len(interactions) if total is None else total
+
+    with metrics.collect(sink):
+        monitor = loop.create_task(runner.monitor(lag_interval))
+        start = loop.time()
+
+        try:
+            for index, interaction in enumerate(itertools.islice(itertools.cycle(interactions), total)):
+                scheduled = start + index / rate
+                if (delay := scheduled - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+
+                runner.register(loop.create_task(runner.dispatch(interaction, scheduled)))
+
+            while runner.tasks:
+                await asyncio.gather(*runner.tasks, return_exceptions=True)
+        finally:
+            monitor.cancel()
+
+    return LoadReport(
+        sent=total,
+        failed=runner.failed,
+        duration=loop.time() - start,
+        histograms=dict(sink.histograms),
+        rest_calls=dict(rest.calls),
+    )
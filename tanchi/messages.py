@@ -0,0 +1,244 @@
+"""Message commands with a parser compiled from the command signature."""
+from __future__ import annotations
+
+import enum
+import inspect
+import re
+import typing
+
+import hikari
+import tanjun
+
+from . import parser, types
+
+__all__ = ["CompiledParser", "create_message_command", "tokenize"]
+
+_TOKEN_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'|(\S+)')
+_ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+_builtin_converters: typing.Mapping[hikari.OptionType, typing.Sequence[typing.Callable[[str], typing.Any]]] = {
+    hikari.OptionType.STRING: (),
+    hikari.OptionType.INTEGER: (int,),
+    hikari.OptionType.FLOAT: (float,),
+    hikari.OptionType.BOOLEAN: (tanjun.conversion.to_bool,),
+}
+"""Converters which don't need dependency injection"""
+
+_discord_converters: typing.Mapping[hikari.OptionType, typing.Sequence[tanjun.commands.slash.ConverterSig]] = {
+    hikari.OptionType.USER: (tanjun.conversion.to_user,),
+    hikari.OptionType.CHANNEL: (tanjun.conversion.to_channel,),
+    hikari.OptionType.ROLE: (tanjun.conversion.to_role,),
+    hikari.OptionType.MENTIONABLE: (tanjun.conversion.to_user, tanjun.conversion.to_role),
+}
+"""Converters of discord objects from mentions or ids"""
+
+
+def tokenize(content: str, limit: typing.Optional[int] = None) -> typing.List[str]:
+    """Split a message into arguments, respecting quotes.
+
+    At most `limit` tokens are returned.
+    """
+    tokens: typing.List[str] = []
+    for match in _TOKEN_PATTERN.finditer(content):
+        if limit is not None and len(tokens) >= limit:
+            break
+
+        double, single, bare = match.groups()
+        if bare is not None:
+            tokens.append(bare)
+        else:
+            tokens.append(_ESCAPE_PATTERN.sub(r"\1", double if double is not None else single))
+
+    return tokens
+
+
+class _Argument:
+    """A positional argument compiled from an option."""
+
+    __slots__ = ("key", "default", "builtin", "converters", "choices", "min_value", "max_value", "channel_types")
+
+    def __init__(self, option: parser.Option, enum_type: typing.Optional[typing.Type[enum.Enum]] = None) -> None:
+        option_type = hikari.OptionType(option.option_type)
+
+        self.key = option.key or option.name
+        self.default = option.default
+        self.builtin = not option.converters and option_type in _builtin_converters
+        self.choices: typing.Optional[typing.Mapping[str, typing.Any]] = None
+        self.min_value = option.min_value
+        self.max_value = option.max_value
+        self.channel_types = option.channel_types and frozenset(option.channel_types)
+
+        if self.builtin:
+            self.converters: typing.Sequence[typing.Any] = _builtin_converters[option_type]
+        elif option_type is hikari.OptionType.USER and option.only_member:
+            self.converters = (tanjun.conversion.to_member,)
+        elif option_type in _discord_converters:
+            self.converters = _discord_converters[option_type]
+        elif option_type is hikari.OptionType.STRING:
+            self.converters = option.converters
+        else:
+            raise TypeError(f"Unsupported message command argument type: {option_type}")
+
+        if option.choices:
+            choices: typing.Dict[str, typing.Any] = {}
+            for name, value in option.choices.items():
+                # the default of an enum argument is a member, so are the parsed values
+                member = value if enum_type is None else enum_type(value)
+                choices[str(value).casefold()] = member
+                choices[name.casefold()] = member
+
+            self.choices = choices
+
+    def _validate(self, value: typing.Any) -> typing.Any:
+        if self.min_value is not None and value < self.min_value:
+            raise tanjun.ConversionError(f"{self.key!r} must be greater than or equal to {self.min_value!r}", self.key)
+        if self.max_value is not None and value > self.max_value:
+            raise tanjun.ConversionError(f"{self.key!r} must be less than or equal to {self.max_value!r}", self.key)
+        if self.channel_types and value.type not in self.channel_types:
+            raise tanjun.ConversionError(f"{self.key!r} must be one of the allowed channel types", self.key)
+
+        return value
+
+    async def convert(self, ctx: tanjun.abc.MessageContext, token: str) -> typing.Any:
+        if self.choices is not None:
+            if (value := self.choices.get(token.casefold())) is None:
+                raise tanjun.ConversionError(f"{self.key!r} must be one of {', '.join(self.choices)}", self.key)
+
+            return value
+
+        if not self.converters:
+            return token
+
+        errors: typing.List[ValueError] = []
+        for converter in self.converters:
+            try:
+                if self.builtin:
+                    return self._validate(converter(token))
+
+                return self._validate(await ctx.call_with_async_di(converter, token))
+            except tanjun.ConversionError:
+                raise
+            except ValueError as exc:
+                errors.append(exc)
+
+        raise tanjun.ConversionError(f"Couldn't convert argument '{self.key}'", self.key, errors=errors)
+
+
+class CompiledParser(tanjun.abc.MessageParser):
+    """A message parser compiled from the options of a command.
+
+    Arguments are positional in the order of the signature, arguments with defaults may be omitted.
+    Quotes group multiple words into a single argument.
+    """
+
+    __slots__ = ("_arguments", "_usage")
+
+    def __init__(
+        self,
+        options: typing.Sequence[parser.Option],
+        usage: str = "",
+        enum_types: typing.Optional[typing.Mapping[str, typing.Type[enum.Enum]]] = None,
+    ) -> None:
+        enum_types = enum_types or {}
+        self._arguments = tuple(_Argument(option, enum_types.get(option.name)) for option in options)
+        self._usage = usage
+
+    @property
+    def usage(self) -> str:
+        """Human readable usage of the arguments."""
+        return self._usage
+
+    def bind_client(self, client: tanjun.abc.Client, /) -> CompiledParser:
+        return self
+
+    def bind_component(self, component: tanjun.abc.Component, /) -> CompiledParser:
+        return self
+
+    def copy(self) -> CompiledParser:
+        return self
+
+    def validate_arg_keys(self, callback_name: str, names: typing.Container[str], /) -> None:
+        for argument in self._arguments:
+            if argument.key not in names:
+                raise ValueError(f"{argument.key!r} is not a valid keyword argument for {callback_name}")
+
+    async def parse(self, ctx: tanjun.abc.MessageContext, /) -> typing.Dict[str, typing.Any]:
+        arguments = self._arguments
+        if not arguments:
+            # like commands without a parser, commands without arguments ignore any trailing text
+            return {}
+
+        # one more token than there are arguments is enough to know there are too many
+        tokens = tokenize(ctx.content, len(arguments) + 1)
+
+        if len(tokens) > len(arguments):
+            key = arguments[-1].key
+            raise tanjun.TooManyArgumentsError("Too many arguments provided", key)
+
+        kwargs: typing.Dict[str, typing.Any] = {}
+        for argument, token in zip(arguments, tokens):
+            kwargs[argument.key] = await argument.convert(ctx, token)
+
+        for argument in arguments[len(tokens) :]:
+            if argument.default is types.UNDEFINED_DEFAULT:
+                raise tanjun.NotEnoughArgumentsError(f"Missing required argument `{argument.key}`", argument.key)
+
+            kwargs[argument.key] = argument.default
+
+        return kwargs
+
+
+def _enum_type(annotation: typing.Any) -> typing.Optional[typing.Type[enum.Enum]]:
+    """Get the enum of an annotation, also when it's optional or annotated"""
+    for tp in (annotation, *typing.get_args(annotation)):
+        if isinstance(tp, type) and issubclass(tp, enum.Enum):
+            return tp
+
+    return None
+
+
+def _format_usage(options: typing.Sequence[parser.Option]) -> str:
+    """Format the usage of arguments like `<required> [optional]`"""
+    return " ".join(
+        f"<{option.name}>" if option.default is types.UNDEFINED_DEFAULT else f"[{option.name}]" for option in options
+    )
+
+
+def create_message_command(
+    function: types.CommandCallbackSigT,
+    name: typing.Optional[str] = None,
+    /,
+    *names: str,
+    validate_arg_keys: bool = True,
+) -> tanjun.MessageCommand[types.CommandCallbackSigT]:
+    """Build a MessageCommand."""
+    parameter_descriptions: typing.Mapping[str, str] = {}
+    if function.__doc__:
+        _, parameter_descriptions = parser.parse_docstring(function.__doc__)
+
+    command = tanjun.MessageCommand(function, name or function.__name__, *names, validate_arg_keys=validate_arg_keys)
+
+    sig = types.signature(function)
+    parameters = iter(sig.parameters.values())
+    context_parameter = next(parameters)
+
+    if context_parameter.annotation is not inspect.Parameter.empty:
+        if not parser.issubclass_(context_parameter.annotation, tanjun.abc.Context):
+            raise TypeError("First argument in a message command must be the context.")
+
+    options: typing.List[parser.Option] = []
+    enum_types: typing.Dict[str, typing.Type[enum.Enum]] = {}
+    for parameter in parameters:
+        option = parser.parse_parameter(
+            name=parameter.name,
+            description=parameter_descriptions.get(parameter.name, "-"),
+            annotation=parameter.annotation,
+            default=parameter.default,
+        )
+        if option:
+            options.append(option)
+            if enum_type := _enum_type(parameter.annotation):
+                enum_types[option.name] = enum_type
+
+    command.set_parser(CompiledParser(options, _format_usage(options), enum_types))
+    return command
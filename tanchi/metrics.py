@@ -0,0 +1,182 @@
+"""Timing metrics of tanchi-built commands.
+
+Metrics are disabled until a sink is set with `set_sink`.
+"""
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import time
+import typing
+
+__all__ = ["Histogram", "HistogramSink", "MetricsSink", "collect", "get_sink", "set_sink"]
+
+
+class MetricsSink(typing.Protocol):
+    """A receiver of timing events.
+
+    Commands are named with their groups, like "group subcommand".
+    Events emitted by tanchi:
+    - "parse": building of a command, named after the command.
+    - "autocomplete": an autocomplete callback, named "command.option".
+    - "autocomplete.shed": an autocomplete call shed by a concurrency limiter, named "command.option".
+    - "converter": conversion of an option, named "command.option".
+    - "invocation": execution of a command, named after the command.
+    - "defer.predicted", "defer.watchdog", "defer.skipped": decisions of an adaptive defer.
+    - "circuit.closed", "circuit.open", "circuit.half_open": state transitions of a circuit breaker,
+      named after the breaker, with the time spent in the previous state.
+    """
+
+    def record(self, event: str, name: str, duration: float, *, failed: bool = False) -> None:
+        """Record a single timed event."""
+
+
+_sink: typing.Optional[MetricsSink] = None
+_local_sink: contextvars.ContextVar[typing.Optional[MetricsSink]] = contextvars.ContextVar(
+    "tanchi_local_sink", default=None
+)
+
+
+class _Tee:
+    """A sink forwarding events to two sinks."""
+
+    __slots__ = ("first", "second")
+
+    def __init__(self, first: MetricsSink, second: MetricsSink) -> None:
+        self.first = first
+        self.second = second
+
+    def record(self, event: str, name: str, duration: float, *, failed: bool = False) -> None:
+        self.first.record(event, name, duration, failed=failed)
+        self.second.record(event, name, duration, failed=failed)
+
+
+def set_sink(sink: typing.Optional[MetricsSink]) -> None:
+    """Set the sink receiving all events. None disables metrics."""
+    global _sink
+    _sink = sink
+
+
+def get_sink() -> typing.Optional[MetricsSink]:
+    """Get the sink receiving events in the current context."""
+    if (local := _local_sink.get()) is None:
+        return _sink
+
+    return local if _sink is None else _Tee(_sink, local)
+
+
+@contextlib.contextmanager
+def collect(sink: MetricsSink) -> typing.Iterator[MetricsSink]:
+    """Also send the events of the current context to a sink.
+
+    Tasks started within the block keep sending to the sink. The sink set with
+    `set_sink` is left in place and keeps receiving every event.
+    """
+    token = _local_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _local_sink.reset(token)
+
+
+def timer() -> typing.Callable[[], float]:
+    """Start a timer, calling it returns the elapsed seconds."""
+    start = time.perf_counter()
+    return lambda: time.perf_counter() - start
+
+
+BUCKETS: typing.Sequence[float] = tuple(1e-6 * 2**i for i in range(27))
+"""Upper bounds of histogram buckets in seconds, from 1µs to a bit over a minute"""
+
+
+class Histogram:
+    """A histogram of durations with logarithmic buckets."""
+
+    __slots__ = ("counts", "count", "failures", "total", "min", "max")
+
+    counts: typing.List[int]
+    count: int
+    failures: int
+    total: float
+    min: float
+    max: float
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, duration: float, *, failed: bool = False) -> None:
+        """Add a duration to the histogram."""
+        self.counts[bisect.bisect_left(BUCKETS, duration)] += 1
+        self.count += 1
+        self.failures += failed
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Get the upper bound of the bucket containing a percentile (0-100)."""
+        if not self.count:
+            return 0.0
+
+        threshold = self.count * percentile / 100
+        seen = 0
+        for bound, count in zip((*BUCKETS, self.max), self.counts):
+            seen += count
+            if seen >= threshold:
+                return min(bound, self.max)
+
+        return self.max
+
+    def summary(self) -> typing.Mapping[str, float]:
+        """Get a summary of the histogram."""
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class HistogramSink:
+    """An in-process sink keeping a histogram for every event and name."""
+
+    histograms: typing.Dict[typing.Tuple[str, str], Histogram]
+
+    def __init__(self) -> None:
+        self.histograms = {}
+
+    def record(self, event: str, name: str, duration: float, *, failed: bool = False) -> None:
+        if (histogram := self.histograms.get((event, name))) is None:
+            histogram = self.histograms[(event, name)] = Histogram()
+
+        histogram.add(duration, failed=failed)
+
+    def get(self, event: str, name: str) -> typing.Optional[Histogram]:
+        """Get the histogram of an event."""
+        return self.histograms.get((event, name))
+
+    def summary(self) -> typing.Mapping[str, typing.Mapping[str, typing.Mapping[str, float]]]:
+        """Get a summary of all histograms grouped by event."""
+        summary: typing.Dict[str, typing.Dict[str, typing.Mapping[str, float]]] = {}
+        for (event, name), histogram in sorted(self.histograms.items()):
+            summary.setdefault(event, {})[name] = histogram.summary()
+
+        return summary
+
+    def clear(self) -> None:
+        """Remove all recorded events."""
+        self.histograms.clear()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
 import inspect
 import re
 import sys
 import typing
+from types import MappingProxyType
 
 import alluka
 import hikari
@@ -12,7 +14,17 @@ import tanjun
 
 from tanchi import autocompletion
 
-from . import conversion, types
+from . import (
+    conversion,
+    deferring,
+    invoking,
+    metrics,
+    profiling,
+    ranking,
+    slash,
+    startup,
+    types,
+)
 
 if typing.TYPE_CHECKING:
     from typing_extensions import TypeGuard
@@ -54,11 +66,68 @@ _hikari_type_mapping: typing.Mapping[typing.Any, hikari.OptionType] = {
 """Generic discord types with hikari equivalents"""
 
 
-@dataclasses.dataclass
+def _slotted(cls: typing.Type[T]) -> typing.Type[T]:
+    """Recreate a dataclass with __slots__
+
+    Backport of ``dataclasses.dataclass(slots=True)`` for python 3.9.
+    """
+    field_names = tuple(field.name for field in dataclasses.fields(cls))  # type: ignore[arg-type]
+
+    namespace = dict(cls.__dict__)
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = field_names
+    if cls.__dataclass_params__.frozen:  # type: ignore[attr-defined]
+        # the generated methods refer to the original class, which instances of the new one aren't
+        namespace["__setattr__"] = _frozen_setattr
+        namespace["__delattr__"] = _frozen_delattr
+
+    return typing.cast("typing.Type[T]", type(cls.__name__, cls.__bases__, namespace))
+
+
+def _frozen_setattr(self: typing.Any, name: str, value: typing.Any) -> None:
+    raise dataclasses.FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _frozen_delattr(self: typing.Any, name: str) -> None:
+    raise dataclasses.FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+_INTERNED_VALUES_SIZE = 1024
+
+_interned_values: typing.OrderedDict[typing.Any, typing.Any] = collections.OrderedDict()
+"""Channel types and choices shared between equal options, the least recently used are evicted"""
+
+
+def _intern_value(key: typing.Any, value: T) -> T:
+    """Get a shared instance of an immutable value"""
+    if (interned := _interned_values.get(key)) is not None:
+        _interned_values.move_to_end(key)
+        return typing.cast("T", interned)
+
+    _interned_values[key] = value
+    if len(_interned_values) > _INTERNED_VALUES_SIZE:
+        _interned_values.popitem(last=False)
+
+    return value
+
+
+def _typed(values: typing.Iterable[typing.Any]) -> typing.Tuple[typing.Tuple[type, typing.Any], ...]:
+    """Pair values with their types, values such as 1, 1.0 and True compare equal but are not interchangeable"""
+    return tuple((type(value), value) for value in values)
+
+
+@_slotted
+@dataclasses.dataclass(frozen=True)
 class Option:
     """An extended tanjun option.
 
     Combines hikari.CommandOption and tanjun._TrackedOption.
+
+    Options are immutable and hashable. Equal channel types and choices are shared between options,
+    tanjun copies them into its own lists once an option is added to a command.
     """
 
     name: str
@@ -76,6 +145,47 @@ class Option:
     only_member: bool = False
     pass_as_kwarg: bool = True
 
+    def __post_init__(self) -> None:
+        if self.channel_types is not None:
+            channel_types = tuple(dict.fromkeys(self.channel_types))
+            object.__setattr__(
+                self, "channel_types", _intern_value(("channel_types", _typed(channel_types)), channel_types)
+            )
+
+        if self.choices is not None:
+            items = tuple(self.choices.items())
+            choices = MappingProxyType(dict(items))
+            key = tuple((name, type(value), value) for name, value in items)
+            object.__setattr__(self, "choices", _intern_value(("choices", key), choices))
+
+        object.__setattr__(self, "converters", tuple(self.converters))
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> typing.Tuple[typing.Any, ...]:
+        """Get a hashable representation of the option"""
+        choices = self.choices and tuple((name, type(value), value) for name, value in self.choices.items())
+        return (
+            self.name,
+            self.description,
+            self.option_type,
+            self.always_float,
+            self.autocomplete,
+            self.channel_types and _typed(self.channel_types),
+            choices,
+            self.converters,
+            type(self.default),
+            self.default,
+            self.key,
+            type(self.min_value),
+            self.min_value,
+            type(self.max_value),
+            self.max_value,
+            self.only_member,
+            self.pass_as_kwarg,
+        )
+
     def add_to_command(self, command: tanjun.SlashCommand[typing.Any]) -> None:
         command._add_option(
             self.name,
@@ -83,7 +193,7 @@ class Option:
             self.option_type,
             always_float=self.always_float,
             autocomplete=self.autocomplete is not None,
-            channel_types=self.channel_types and list(set(self.channel_types)),
+            channel_types=self.channel_types,
             choices=self.choices,
             converters=self.converters,
             default=self.default,
@@ -292,42 +402,58 @@ def create_command(
     *,
     name: typing.Optional[str] = None,
     always_defer: bool = False,
+    adaptive_defer: typing.Optional[deferring.AdaptiveDefer] = None,
     default_member_permissions: typing.Union[hikari.Permissions, int, None] = None,
     default_to_ephemeral: typing.Optional[bool] = None,
     dm_enabled: typing.Optional[bool] = None,
     is_global: bool = True,
+    popularity: typing.Optional[ranking.Popularity] = None,
+    profiler: typing.Optional[profiling.Profiler] = None,
     sort_options: bool = True,
     validate_arg_keys: bool = True,
     **kwargs: typing.Any,
-) -> tanjun.SlashCommand[types.CommandCallbackSigT]:
+) -> slash.SlashCommand[types.CommandCallbackSigT]:
     """Build a SlashCommand."""
+    elapsed = metrics.timer()
+    recording = startup.record(function)
+
     if not (doc := function.__doc__):
         raise TypeError("Function missing docstring, cannot create descriptions")
 
     description, parameter_descriptions = parse_docstring(doc)
+    if recording:
+        recording.lap("docstring")
 
-    command = tanjun.SlashCommand(
+    command: slash.SlashCommand[types.CommandCallbackSigT] = slash.SlashCommand(
         function,
         name or function.__name__,
         description,
         always_defer=always_defer,
+        adaptive_defer=adaptive_defer,
         default_member_permissions=default_member_permissions,
         default_to_ephemeral=default_to_ephemeral,
         dm_enabled=dm_enabled,
         is_global=is_global,
+        popularity=popularity,
+        profiler=profiler,
         sort_options=sort_options,
         validate_arg_keys=validate_arg_keys,
         **kwargs,
     )
+    if recording:
+        recording.lap("command")
 
     sig = types.signature(function)
     parameters = iter(sig.parameters.values())
     context_parameter = next(parameters)
+    if recording:
+        recording.lap("signature")
 
     if context_parameter.annotation is not inspect.Parameter.empty:
         if not issubclass_(context_parameter.annotation, tanjun.abc.Context):
             raise TypeError("First argument in a slash command must be the context.")
 
+    options: typing.List[Option] = []
     for parameter in parameters:
         option = parse_parameter(
             name=parameter.name,
@@ -335,7 +461,21 @@ def create_command(
             annotation=parameter.annotation,
             default=parameter.default,
         )
+        if recording:
+            recording.lap("parameters", parameter.annotation)
+
         if option:
             option.add_to_command(command)
+            options.append(option)
+            if recording:
+                recording.lap("options")
+
+    command.set_invoker(invoking.build_invoker(options))
+    if recording:
+        recording.lap("invoker")
+        recording.finish(command.name)
+
+    if sink := metrics.get_sink():
+        sink.record("parse", command.name, elapsed())
 
     return command
@@ -0,0 +1,135 @@
+"""Sampling profiler for slow invocations of commands and autocompleters.
+
+Only one invocation is profiled at a time since python allows a single active profiler.
+Other tasks running on the event loop while a profiled invocation awaits show up in its profile.
+"""
+from __future__ import annotations
+
+import cProfile
+import dataclasses
+import heapq
+import io
+import itertools
+import os
+import pstats
+import random
+import time
+import typing
+
+__all__ = ["Profile", "Profiler"]
+
+T = typing.TypeVar("T")
+
+_active = False
+"""Whether any profiler is currently running"""
+
+
+@dataclasses.dataclass(frozen=True)
+class Profile:
+    """A profile of a single invocation."""
+
+    name: str
+    duration: float
+    created_at: float
+    stats: pstats.Stats = dataclasses.field(repr=False)
+
+    def format(self, *, sort: str = "cumulative", limit: int = 30) -> str:
+        """Format the profile as a pstats table."""
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.add(self.stats)
+        stats.sort_stats(sort).print_stats(limit)
+        return f"{self.name} took {self.duration * 1000:.2f}ms\n{stream.getvalue()}"
+
+
+class Profiler:
+    """Profile a sample of invocations and keep the slowest ones.
+
+    Args:
+        sample_rate: Probability of profiling an invocation.
+        threshold: Minimum duration in seconds for a profile to be kept.
+        keep: Amount of the slowest profiles kept per name.
+    """
+
+    sample_rate: float
+    threshold: float
+    keep: int
+
+    def __init__(self, *, sample_rate: float = 1.0, threshold: float = 0.0, keep: int = 5) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("Sample rate must be between 0 and 1")
+        if keep < 1:
+            raise ValueError("At least one profile must be kept")
+
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.keep = keep
+
+        self._profiles: typing.Dict[str, typing.List[typing.Tuple[float, int, Profile]]] = {}
+        self._counter = itertools.count()
+
+    def _should_profile(self) -> bool:
+        return not _active and (self.sample_rate >= 1 or random.random() < self.sample_rate)
+
+    def _store(self, profile: Profile) -> None:
+        heap = self._profiles.setdefault(profile.name, [])
+        item = (profile.duration, next(self._counter), profile)
+
+        if len(heap) < self.keep:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    async def run(
+        self,
+        name: str,
+        callback: typing.Callable[..., typing.Awaitable[T]],
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> T:
+        """Run a coroutine function, profiling it if it's sampled."""
+        global _active
+
+        if not self._should_profile():
+            return await callback(*args, **kwargs)
+
+        _active = True
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                return await callback(*args, **kwargs)
+            finally:
+                profile.disable()
+        finally:
+            _active = False
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self._store(Profile(name, duration, time.time(), pstats.Stats(profile)))
+
+    def get_profiles(self, name: typing.Optional[str] = None) -> typing.Sequence[Profile]:
+        """Get the kept profiles sorted from the slowest."""
+        heaps = [self._profiles.get(name, [])] if name else self._profiles.values()
+        items = sorted(itertools.chain.from_iterable(heaps), reverse=True)
+        return [profile for _, _, profile in items]
+
+    def dump(self, name: typing.Optional[str] = None, *, sort: str = "cumulative", limit: int = 30) -> str:
+        """Format all kept profiles."""
+        return "\n".join(profile.format(sort=sort, limit=limit) for profile in self.get_profiles(name))
+
+    def dump_stats(self, directory: str) -> typing.Sequence[str]:
+        """Save all kept profiles as .prof files, returns their paths."""
+        os.makedirs(directory, exist_ok=True)
+
+        paths: typing.List[str] = []
+        for profile in self.get_profiles():
+            path = os.path.join(directory, f"{profile.name}-{int(profile.created_at * 1000)}.prof")
+            profile.stats.dump_stats(path)
+            paths.append(path)
+
+        return paths
+
+    def clear(self) -> None:
+        """Remove all kept profiles."""
+        self._profiles.clear()
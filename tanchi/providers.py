@@ -0,0 +1,138 @@
+"""Stale-while-revalidate snapshots of slowly changing data for autocompleters."""
+from __future__ import annotations
+
+import asyncio
+import collections
+import inspect
+import time
+import typing
+
+import hikari
+import tanjun
+
+from . import types
+
+__all__ = ["DataProvider"]
+
+T = typing.TypeVar("T")
+Scope = typing.Optional[hikari.Snowflake]
+FetchSig = typing.Callable[[Scope], types.MaybeAwaitable[T]]
+
+
+class _Snapshot(typing.Generic[T]):
+    __slots__ = ("data", "fetched_at", "accessed_at")
+
+    def __init__(self, data: T, fetched_at: float) -> None:
+        self.data = data
+        self.fetched_at = fetched_at
+        self.accessed_at = fetched_at
+
+
+class DataProvider(typing.Generic[T]):
+    """Serve snapshots of slowly changing data, refreshing them in the background.
+
+    A snapshot is kept either globally or for every guild.
+    Stale snapshots are still served while a single refresh runs in the background.
+
+    Args:
+        fetch: Callback fetching the data of a scope, receives the guild id or None.
+        ttl: Seconds after which a snapshot is refreshed.
+        per_guild: Whether every guild has its own snapshot.
+        max_scopes: Maximum amount of snapshots, the least recently used are evicted.
+        idle_timeout: Seconds after which snapshots which are not used are evicted.
+    """
+
+    ttl: float
+    per_guild: bool
+    max_scopes: int
+    idle_timeout: float
+
+    def __init__(
+        self,
+        fetch: FetchSig[T],
+        *,
+        ttl: float = 60.0,
+        per_guild: bool = False,
+        max_scopes: int = 1000,
+        idle_timeout: float = 3600.0,
+    ) -> None:
+        if max_scopes < 1:
+            raise ValueError("At least one scope must be kept")
+
+        self.ttl = ttl
+        self.per_guild = per_guild
+        self.max_scopes = max_scopes
+        self.idle_timeout = idle_timeout
+
+        self._fetch = fetch
+        self._snapshots: typing.OrderedDict[Scope, _Snapshot[T]] = collections.OrderedDict()
+        self._refreshes: typing.Dict[Scope, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def _scope(self, context: typing.Optional[tanjun.abc.Context]) -> Scope:
+        return context.guild_id if self.per_guild and context is not None else None
+
+    def _evict(self, now: float) -> None:
+        # snapshots are ordered by their last access
+        while self._snapshots:
+            scope, snapshot = next(iter(self._snapshots.items()))
+            if len(self._snapshots) <= self.max_scopes and now - snapshot.accessed_at < self.idle_timeout:
+                break
+
+            del self._snapshots[scope]
+
+    async def _load(self, scope: Scope) -> T:
+        data = self._fetch(scope)
+        if inspect.isawaitable(data):
+            data = await data
+
+        data = typing.cast("T", data)
+
+        now = time.monotonic()
+        if snapshot := self._snapshots.get(scope):
+            snapshot.data, snapshot.fetched_at = data, now
+        else:
+            self._snapshots[scope] = _Snapshot(data, now)
+
+        self._evict(now)
+        return data
+
+    def _refreshed(self, scope: Scope, task: asyncio.Task[T]) -> None:
+        self._refreshes.pop(scope, None)
+        if not task.cancelled():
+            # a failed background refresh keeps serving the old snapshot
+            task.exception()
+
+    def refresh(self, scope: Scope = None) -> asyncio.Task[T]:
+        """Refresh the snapshot of a scope, joining a refresh which is already running."""
+        if (task := self._refreshes.get(scope)) is None:
+            task = self._refreshes[scope] = asyncio.create_task(self._load(scope))
+            task.add_done_callback(lambda task: self._refreshed(scope, task))
+
+        return task
+
+    async def get(self, context: typing.Optional[tanjun.abc.Context] = None) -> T:
+        """Get the snapshot for the scope of a context.
+
+        Only waits for the data if there's no snapshot yet.
+        """
+        scope = self._scope(context)
+        now = time.monotonic()
+        self._evict(now)
+
+        if (snapshot := self._snapshots.get(scope)) is None:
+            return await asyncio.shield(self.refresh(scope))
+
+        snapshot.accessed_at = now
+        self._snapshots.move_to_end(scope)
+
+        if now - snapshot.fetched_at >= self.ttl:
+            self.refresh(scope)
+
+        return snapshot.data
+
+    def invalidate(self, scope: Scope = None) -> None:
+        """Remove the snapshot of a scope."""
+        self._snapshots.pop(scope, None)
@@ -0,0 +1,187 @@
+"""Popularity of submitted option values, counted in fixed-size frequency sketches.
+
+Autocompleters ranking by popularity move the values users actually submit to the top of their choices,
+so fewer keystrokes, and fewer autocomplete requests, are needed to reach them.
+"""
+from __future__ import annotations
+
+import array
+import typing
+
+import hikari
+
+if typing.TYPE_CHECKING:
+    import tanjun
+
+    from . import types
+
+__all__ = ["CountMinSketch", "Popularity"]
+
+_RENORMALIZE_AT = 2.0**40
+"""Increment above which the counters are scaled down to keep their precision"""
+
+_RECORDED_TYPES = frozenset((hikari.OptionType.STRING, hikari.OptionType.INTEGER, hikari.OptionType.FLOAT))
+
+_MASK = 2**64 - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix(value: int) -> int:
+    """Finalize a 64-bit splitmix64 state, so nearby states give unrelated outputs"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+class CountMinSketch:
+    """Approximate counts of values in a fixed amount of memory.
+
+    Estimates are never below the decayed count of a value, colliding values can only raise them.
+    Every `half_life` additions all counts are halved, so values which stopped being popular fade out.
+    Decay is done by doubling the increment instead of halving every counter.
+
+    Args:
+        width: Counters per row, more counters mean less collisions.
+        depth: Rows of counters, each hashing values differently.
+        half_life: Additions after which counts are halved, never if None.
+    """
+
+    __slots__ = ("_counters", "_increment", "_until_decay", "depth", "half_life", "width")
+
+    width: int
+    depth: int
+    half_life: typing.Optional[int]
+
+    def __init__(self, width: int = 2048, depth: int = 4, *, half_life: typing.Optional[int] = 10_000) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError("The width and depth must be at least 1")
+
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life
+        self._counters = array.array("d", bytes(8 * width * depth))
+        self._increment = 1.0
+        self._until_decay = half_life
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _indexes(self, value: typing.Hashable) -> typing.List[int]:
+        # every row takes the next output of a splitmix64 generator seeded with the hash,
+        # so values colliding in one row are unlikely to collide in the others
+        width = self.width
+        state = hash(value) & _MASK
+        indexes = []
+        for row in range(self.depth):
+            state = (state + _GOLDEN_GAMMA) & _MASK
+            indexes.append(row * width + _mix(state) % width)
+
+        return indexes
+
+    def add(self, value: typing.Hashable, count: int = 1) -> None:
+        """Count a value.
+
+        Only the counters holding the lowest estimate are raised, which keeps collisions from inflating the rest.
+        """
+        counters = self._counters
+        indexes = self._indexes(value)
+        target = min(counters[index] for index in indexes) + count * self._increment
+        for index in indexes:
+            if counters[index] < target:
+                counters[index] = target
+
+        if self._until_decay is not None:
+            self._until_decay -= 1
+            if self._until_decay <= 0:
+                self.decay()
+
+    def estimate(self, value: typing.Hashable) -> float:
+        """Get the decayed count of a value."""
+        counters = self._counters
+        return min(counters[index] for index in self._indexes(value)) / self._increment
+
+    def decay(self) -> None:
+        """Halve every count."""
+        self._until_decay = self.half_life
+        self._increment *= 2
+        if self._increment >= _RENORMALIZE_AT:
+            increment = self._increment
+            self._counters = array.array("d", (counter / increment for counter in self._counters))
+            self._increment = 1.0
+
+    def clear(self) -> None:
+        """Forget every count."""
+        self._counters = array.array("d", bytes(8 * len(self._counters)))
+        self._increment = 1.0
+        self._until_decay = self.half_life
+
+
+class Popularity:
+    """How often values are submitted for each option, by command and option name.
+
+    Command names include their groups and subcommands, separated by spaces.
+    Memory use is fixed per option, however many distinct values are submitted.
+
+    Args:
+        width: Counters per row of each sketch.
+        depth: Rows of counters of each sketch.
+        half_life: Submissions of an option after which its counts are halved.
+    """
+
+    __slots__ = ("_sketches", "depth", "half_life", "width")
+
+    width: int
+    depth: int
+    half_life: typing.Optional[int]
+
+    def __init__(self, *, width: int = 2048, depth: int = 4, half_life: typing.Optional[int] = 10_000) -> None:
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life
+        self._sketches: typing.Dict[typing.Tuple[str, str], CountMinSketch] = {}
+
+    @property
+    def sketches(self) -> typing.Mapping[typing.Tuple[str, str], CountMinSketch]:
+        """The sketch of every command and option with submitted values."""
+        return self._sketches
+
+    def record(self, command: str, option: str, value: typing.Hashable) -> None:
+        """Count a value submitted for an option of a command."""
+        if (sketch := self._sketches.get((command, option))) is None:
+            sketch = self._sketches[(command, option)] = CountMinSketch(
+                self.width, self.depth, half_life=self.half_life
+            )
+
+        sketch.add(value)
+
+    def record_options(self, command: str, options: typing.Mapping[str, tanjun.abc.SlashOption]) -> None:
+        """Count the string, integer and float values submitted with a command."""
+        for name, option in options.items():
+            if option.type in _RECORDED_TYPES:
+                self.record(command, name, option.value)
+
+    def estimate(self, command: str, option: str, value: typing.Hashable) -> float:
+        """Get how often a value was submitted for an option, recent submissions weigh more."""
+        if (sketch := self._sketches.get((command, option))) is None:
+            return 0.0
+
+        return sketch.estimate(value)
+
+    def rank(self, command: str, option: str, choices: types.Choices, *, limit: int = 25) -> types.Choices:
+        """Order choices by popularity and keep the first `limit`.
+
+        Choices which are equally popular, such as values which were never submitted, keep their order.
+        Mappings are ranked by their values.
+        """
+        sketch = self._sketches.get((command, option))
+        if isinstance(choices, typing.Sequence):
+            if sketch is not None:
+                choices = sorted(choices, key=lambda value: -sketch.estimate(value))
+
+            return choices[:limit]
+
+        items = list(choices.items())
+        if sketch is not None:
+            items.sort(key=lambda item: -sketch.estimate(item[1]))
+
+        return dict(items[:limit])
@@ -0,0 +1,216 @@
+"""Incremental reloading of command modules.
+
+Commands whose function, docstring, parsed options and build arguments didn't change
+are reused as is, only the changed commands are built again.
+"""
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import sys
+import types as builtin_types
+import typing
+
+import tanjun
+
+from . import autocompletion, parser, slash, types
+
+__all__ = ["ReloadResult", "Reloader", "build"]
+
+CommandT = typing.TypeVar("CommandT", bound=tanjun.abc.BaseSlashCommand)
+
+_active: typing.Optional[Reloader] = None
+"""The reloader currently loading a module"""
+
+
+def _fingerprint_code(code: builtin_types.CodeType) -> typing.Tuple[typing.Any, ...]:
+    """Fingerprint a code object, ignoring line numbers"""
+    consts = tuple(
+        _fingerprint_code(const) if isinstance(const, builtin_types.CodeType) else repr(const)
+        for const in code.co_consts
+    )
+    return (code.co_code, consts, code.co_names, code.co_varnames, code.co_freevars)
+
+
+def _fingerprint_value(value: typing.Any) -> typing.Any:
+    """Fingerprint a value, replacing the objects a reload creates again by their name and code"""
+    if isinstance(value, tuple):
+        return tuple(_fingerprint_value(item) for item in value)
+
+    if isinstance(value, autocompletion.Autocompleter):
+        return ("autocompleter", _fingerprint_value(value.callback))
+
+    if isinstance(value, type):
+        return ("type", value.__module__, value.__qualname__)
+
+    if (code := getattr(value, "__code__", None)) is not None:
+        return ("function", value.__module__, value.__qualname__, _fingerprint_code(code))
+
+    if callable(value) and hasattr(value, "__qualname__"):
+        return ("callable", getattr(value, "__module__", None), value.__qualname__)
+
+    if getattr(type(value), "__hash__", None) is object.__hash__:
+        # hashed by identity, which changes with every instance
+        return ("instance", _fingerprint_value(type(value)))
+
+    return value
+
+
+def _fingerprint_options(function: typing.Callable[..., typing.Any]) -> typing.Tuple[typing.Any, ...]:
+    """Fingerprint the options parsed from the parameters of a command function.
+
+    Special types such as Range all repr as their class, their bounds, choices,
+    converters and autocompleters are only found in the parsed options.
+    """
+    parameters = list(types.signature(function).parameters.values())[1:]
+    options = (
+        parser.parse_parameter(name=parameter.name, annotation=parameter.annotation, default=parameter.default)
+        for parameter in parameters
+    )
+    return tuple(option and _fingerprint_value(option._key()) for option in options)
+
+
+def fingerprint(
+    function: typing.Callable[..., typing.Any], kwargs: typing.Mapping[str, typing.Any]
+) -> typing.Optional[int]:
+    """Fingerprint a command function together with the arguments it's built with.
+
+    None if the function can't be fingerprinted, such as when an option has an unhashable default.
+    """
+    code = getattr(function, "__code__", None)
+    try:
+        return hash(
+            (
+                code and _fingerprint_code(code),
+                function.__doc__,
+                _fingerprint_options(function),
+                repr(getattr(function, "__defaults__", None)),
+                repr(getattr(function, "__kwdefaults__", None)),
+                repr(sorted(kwargs.items())),
+            )
+        )
+    except Exception:
+        # building the command reports errors in the signature
+        return None
+
+
+def _declaration(command: tanjun.abc.BaseSlashCommand) -> typing.Tuple[typing.Any, ...]:
+    """Get everything about a command which is declared to discord"""
+    builder = command.build()
+    return (
+        builder.name,
+        builder.description,
+        tuple(builder.options),
+        builder.default_member_permissions,
+        builder.is_dm_enabled,
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class ReloadResult:
+    """Differences between the commands of a module before and after a reload."""
+
+    added: typing.Sequence[str]
+    changed: typing.Sequence[str]
+    removed: typing.Sequence[str]
+    unchanged: typing.Sequence[str]
+    commands: typing.Mapping[str, tanjun.abc.BaseSlashCommand]
+    previous: typing.Mapping[str, tanjun.abc.BaseSlashCommand]
+
+    @property
+    def updates(self) -> typing.Sequence[tanjun.abc.BaseSlashCommand]:
+        """Commands which have to be declared again.
+
+        Commands whose code changed but whose declaration didn't are not included.
+        """
+        changed = [
+            name for name in self.changed if _declaration(self.commands[name]) != _declaration(self.previous[name])
+        ]
+        return [self.commands[name] for name in (*self.added, *changed)]
+
+    def apply(self, component: tanjun.Component) -> None:
+        """Replace the old versions of reloaded commands in a component."""
+        for name in (*self.changed, *self.removed):
+            if self.previous[name] in component.slash_commands:
+                component.remove_slash_command(self.previous[name])
+
+        for name in (*self.added, *self.changed):
+            component.add_slash_command(self.commands[name])
+
+
+class Reloader:
+    """Load command modules, rebuilding only the commands which changed."""
+
+    def __init__(self) -> None:
+        self._builds: typing.Dict[
+            typing.Tuple[str, str], typing.Tuple[typing.Optional[int], tanjun.abc.BaseSlashCommand]
+        ] = {}
+        self._commands: typing.Dict[str, typing.Dict[str, tanjun.abc.BaseSlashCommand]] = {}
+
+    def _build(
+        self,
+        function: typing.Callable[..., typing.Any],
+        factory: typing.Callable[..., CommandT],
+        kwargs: typing.Mapping[str, typing.Any],
+    ) -> CommandT:
+        key = (function.__module__, function.__qualname__)
+        function_fingerprint = fingerprint(function, kwargs)
+
+        if function_fingerprint is not None and (cached := self._builds.get(key)) and cached[0] == function_fingerprint:
+            return typing.cast("CommandT", cached[1])
+
+        command = factory(function, **kwargs)
+        self._builds[key] = (function_fingerprint, command)
+        return command
+
+    def load(self, name: str) -> ReloadResult:
+        """Import or reload a module and compare its commands with the last load."""
+        global _active
+
+        _active = self
+        try:
+            if module := sys.modules.get(name):
+                # reloading keeps old attributes around, removed commands would be found again
+                removed = {
+                    attribute: value
+                    for attribute, value in vars(module).items()
+                    if isinstance(value, slash.SlashCommand)
+                }
+                for attribute in removed:
+                    delattr(module, attribute)
+
+                try:
+                    module = importlib.reload(module)
+                except BaseException:
+                    # a module which failed to reload keeps its previous commands
+                    vars(module).update(removed)
+                    raise
+            else:
+                module = importlib.import_module(name)
+        finally:
+            _active = None
+
+        previous = self._commands.get(name, {})
+        commands: typing.Dict[str, tanjun.abc.BaseSlashCommand] = {
+            command.name: command for command in vars(module).values() if isinstance(command, slash.SlashCommand)
+        }
+        self._commands[name] = commands
+
+        return ReloadResult(
+            added=[name for name in commands if name not in previous],
+            changed=[name for name, command in commands.items() if name in previous and previous[name] is not command],
+            removed=[name for name in previous if name not in commands],
+            unchanged=[name for name, command in commands.items() if previous.get(name) is command],
+            commands=commands,
+            previous=previous,
+        )
+
+
+def build(
+    function: typing.Callable[..., typing.Any], factory: typing.Callable[..., CommandT], **kwargs: typing.Any
+) -> CommandT:
+    """Build a command, reusing the previous build if it's being reloaded unchanged."""
+    if _active is None:
+        return factory(function, **kwargs)
+
+    return _active._build(function, factory, kwargs)
@@ -0,0 +1,157 @@
+"""Tanjun slash command extended with tanchi's runtime features."""
+from __future__ import annotations
+
+import functools
+import typing
+
+import hikari
+import tanjun
+
+from . import deferring, invoking, metrics, profiling, ranking, types
+
+__all__ = ["SlashCommand"]
+
+_TrackedOption = tanjun.commands.slash._TrackedOption
+
+
+def _full_name(command: tanjun.abc.BaseSlashCommand) -> str:
+    """Get the name of a command including its groups"""
+    names = [command.name]
+    parent = command.parent
+    while parent is not None:
+        names.append(parent.name)
+        parent = parent.parent
+
+    return " ".join(reversed(names))
+
+
+class _MeasuredOption(_TrackedOption):
+    """A tracked option which reports the latency of its converters."""
+
+    __slots__ = ("command",)
+
+    def __init__(self, option: typing.Any, command: tanjun.abc.BaseSlashCommand) -> None:
+        super().__init__(
+            key=option.key,
+            name=option.name,
+            option_type=option.type,
+            always_float=option.is_always_float,
+            converters=option.converters,
+            only_member=option.is_only_member,
+            default=option.default,
+        )
+        self.command = command
+
+    @property
+    def metric_name(self) -> str:
+        # commands are added to their groups after their options, the name is only known when used
+        return f"{_full_name(self.command)}.{self.name}"
+
+    async def convert(self, ctx: tanjun.abc.SlashContext, value: typing.Any, /) -> typing.Any:
+        if (sink := metrics.get_sink()) is None:
+            return await super().convert(ctx, value)
+
+        name = self.metric_name
+        elapsed = metrics.timer()
+        try:
+            result = await super().convert(ctx, value)
+        except Exception:
+            sink.record("converter", name, elapsed(), failed=True)
+            raise
+
+        sink.record("converter", name, elapsed())
+        return result
+
+
+class SlashCommand(tanjun.SlashCommand[types.CommandCallbackSigT]):
+    """A slash command built by tanchi.
+
+    Accepts all arguments of tanjun.SlashCommand, a profiler, an adaptive defer
+    and a popularity tracker counting the submitted option values.
+    """
+
+    __slots__ = ("_adaptive_defer", "_invoker", "_popularity", "_profiler")
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        adaptive_defer: typing.Optional[deferring.AdaptiveDefer] = None,
+        popularity: typing.Optional[ranking.Popularity] = None,
+        profiler: typing.Optional[profiling.Profiler] = None,
+        **kwargs: typing.Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._adaptive_defer = adaptive_defer
+        self._invoker: typing.Optional[invoking.InvokerSig] = None
+        self._popularity = popularity
+        self._profiler = profiler
+
+    @property
+    def adaptive_defer(self) -> typing.Optional[deferring.AdaptiveDefer]:
+        """The adaptive defer deciding whether to defer this command."""
+        return self._adaptive_defer
+
+    @property
+    def popularity(self) -> typing.Optional[ranking.Popularity]:
+        """The popularity tracker counting the values submitted with this command."""
+        return self._popularity
+
+    @property
+    def profiler(self) -> typing.Optional[profiling.Profiler]:
+        """The profiler sampling invocations of this command."""
+        return self._profiler
+
+    def _add_option(
+        self, name: str, description: str, *args: typing.Any, **kwargs: typing.Any
+    ) -> SlashCommand[typing.Any]:
+        super()._add_option(name, description, *args, **kwargs)
+        self._invoker = None
+
+        if (option := self._tracked_options.get(name)) and option.converters:
+            self._tracked_options[name] = _MeasuredOption(option, self)
+
+        return self
+
+    def set_invoker(self, invoker: typing.Optional[invoking.InvokerSig], /) -> SlashCommand[types.CommandCallbackSigT]:
+        """Set a specialized function processing the options of this command.
+
+        The invoker is removed whenever an option is added.
+        """
+        self._invoker = invoker
+        return self
+
+    async def _process_args(self, ctx: tanjun.abc.SlashContext, /) -> typing.Mapping[str, typing.Any]:
+        if self._invoker is None:
+            return await super()._process_args(ctx)
+
+        return await self._invoker(ctx, self._tracked_options)
+
+    async def execute(
+        self,
+        ctx: tanjun.abc.SlashContext,
+        /,
+        option: typing.Optional[hikari.CommandInteractionOption] = None,
+        *,
+        hooks: typing.Optional[typing.MutableSet[tanjun.abc.SlashHooks]] = None,
+    ) -> None:
+        name = _full_name(self)
+        execute = super().execute
+        if self._profiler is not None:
+            execute = functools.partial(self._profiler.run, name, execute)
+        if self._adaptive_defer is not None:
+            execute = functools.partial(self._adaptive_defer.run, name, ctx, execute)
+
+        if (sink := metrics.get_sink()) is None:
+            await execute(ctx, option, hooks=hooks)
+        else:
+            elapsed = metrics.timer()
+            try:
+                await execute(ctx, option, hooks=hooks)
+            except Exception:
+                sink.record("invocation", name, elapsed(), failed=True)
+                raise
+
+            sink.record("invocation", name, elapsed())
+
+        if self._popularity is not None:
+            self._popularity.record_options(name, ctx.options)
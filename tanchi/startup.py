@@ -0,0 +1,161 @@
+"""Profiling of command construction at startup.
+
+While a module is profiled, every command built by `create_command` records the time of its phases,
+the memory it allocated and the time spent on each of its annotations.
+"""
+from __future__ import annotations
+
+import collections
+import dataclasses
+import importlib
+import sys
+import time
+import tracemalloc
+import typing
+
+__all__ = ["AnnotationReport", "CommandReport", "PHASES", "StartupReport", "profile_startup", "record"]
+
+PHASES = ("docstring", "command", "signature", "parameters", "options", "invoker")
+"""Phases of building a command, in order"""
+
+_active: typing.Optional[_Session] = None
+"""The session recording the commands being built"""
+
+
+@dataclasses.dataclass(frozen=True)
+class CommandReport:
+    """Time and memory spent building a command."""
+
+    name: str
+    module: str
+    duration: float
+    phases: typing.Mapping[str, float]
+    allocated: int
+    """Peak bytes allocated while building the command, 0 if memory wasn't traced"""
+
+
+@dataclasses.dataclass(frozen=True)
+class AnnotationReport:
+    """Time spent resolving an annotation across all commands."""
+
+    annotation: str
+    count: int
+    duration: float
+
+
+@dataclasses.dataclass(frozen=True)
+class StartupReport:
+    """Commands and annotations sorted by the time they took, the slowest first."""
+
+    modules: typing.Mapping[str, float]
+    """Import time of every module"""
+    commands: typing.Sequence[CommandReport]
+    annotations: typing.Sequence[AnnotationReport]
+
+    def format(self, *, limit: int = 20) -> str:
+        """Format the report as tables, showing at most `limit` rows of each."""
+        lines = [f"{'module':<40} {'import ms':>10}"]
+        lines += [f"{module:<40} {duration * 1000:>10.3f}" for module, duration in self.modules.items()]
+
+        lines += [
+            "",
+            f"{'command':<30} {'total ms':>10} " + " ".join(f"{phase:>10}" for phase in PHASES) + " alloc KiB",
+        ]
+        for command in self.commands[:limit]:
+            phases = " ".join(f"{command.phases.get(phase, 0.0) * 1000:>10.3f}" for phase in PHASES)
+            lines.append(
+                f"{command.name:<30} {command.duration * 1000:>10.3f} {phases} {command.allocated / 1024:>9.1f}"
+            )
+
+        lines += ["", f"{'annotation':<60} {'count':>6} {'total ms':>10}"]
+        for annotation in self.annotations[:limit]:
+            lines.append(f"{annotation.annotation[:60]:<60} {annotation.count:>6} {annotation.duration * 1000:>10.3f}")
+
+        return "\n".join(lines)
+
+
+class _Recording:
+    """Laps of a single command being built"""
+
+    __slots__ = ("_session", "function", "start", "last", "phases", "memory")
+
+    def __init__(self, session: _Session, function: typing.Callable[..., typing.Any]) -> None:
+        self._session = session
+        self.function = function
+        self.phases: typing.Dict[str, float] = {}
+        self.memory = 0
+        if session.trace_memory:
+            tracemalloc.reset_peak()
+            self.memory = tracemalloc.get_traced_memory()[0]
+
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, phase: str, annotation: typing.Any = None) -> None:
+        """Add the time since the last lap to a phase."""
+        now = time.perf_counter()
+        duration = now - self.last
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+        if annotation is not None:
+            self._session.annotations[repr(annotation)].append(duration)
+
+        self.last = time.perf_counter()
+
+    def finish(self, name: str) -> None:
+        """Finish the command."""
+        duration = time.perf_counter() - self.start
+        allocated = tracemalloc.get_traced_memory()[1] - self.memory if self._session.trace_memory else 0
+        module = getattr(self.function, "__module__", None) or "<unknown>"
+        self._session.commands.append(CommandReport(name, module, duration, self.phases, allocated))
+
+
+class _Session:
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.commands: typing.List[CommandReport] = []
+        self.annotations: typing.DefaultDict[str, typing.List[float]] = collections.defaultdict(list)
+
+
+def record(function: typing.Callable[..., typing.Any]) -> typing.Optional[_Recording]:
+    """Start recording a command if startup is being profiled."""
+    return _Recording(_active, function) if _active else None
+
+
+def profile_startup(*modules: str, trace_memory: bool = True) -> StartupReport:
+    """Import modules and profile the commands built meanwhile.
+
+    Modules which were imported already are reloaded.
+    Tracing memory makes everything slower, timings are more accurate without it.
+    """
+    global _active
+
+    session = _Session(trace_memory)
+    import_times: typing.Dict[str, float] = {}
+
+    was_tracing = tracemalloc.is_tracing()
+    if trace_memory and not was_tracing:
+        tracemalloc.start()
+
+    _active = session
+    try:
+        for name in modules:
+            start = time.perf_counter()
+            if module := sys.modules.get(name):
+                importlib.reload(module)
+            else:
+                importlib.import_module(name)
+
+            import_times[name] = time.perf_counter() - start
+    finally:
+        _active = None
+        if trace_memory and not was_tracing:
+            tracemalloc.stop()
+
+    annotations = [
+        AnnotationReport(annotation, len(durations), sum(durations))
+        for annotation, durations in session.annotations.items()
+    ]
+    return StartupReport(
+        modules=import_times,
+        commands=sorted(session.commands, key=lambda command: command.duration, reverse=True),
+        annotations=sorted(annotations, key=lambda annotation: annotation.duration, reverse=True),
+    )
@@ -7,7 +7,8 @@ import typing
 import hikari
 import tanjun
 
-from . import autocompletion
+if typing.TYPE_CHECKING:
+    from . import autocompletion
 
 __all__ = ["Autocompleted", "Converted", "Mentionable", "Range"]
 
@@ -168,5 +169,8 @@ class Autocompleted(SpecialType, metaclass=AutocompletedMeta):
         autocomplete: autocompletion.AutocompleteSig,
         *converters: tanjun.commands.slash.ConverterSig,
     ) -> None:
+        # imported here since autocompletion needs this module to be imported first
+        from . import autocompletion
+
         self.autocomplete = autocompletion.as_autocomplete(autocomplete)  # type: ignore[assignment]
         self.converters = converters
@@ -0,0 +1,270 @@
+"""Warm-up of autocompleters before interactions are served.
+
+The first keystrokes are the most frequent and often the most expensive queries,
+warming up precomputes their choices while the client is starting.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import functools
+import time
+import typing
+
+import alluka
+import hikari
+import tanjun
+
+from . import autocompletion, types
+
+__all__ = ["WarmupContext", "WarmupReport", "Warmup", "common_prefixes"]
+
+
+def common_prefixes(sample: typing.Iterable[str], *, max_length: int = 2, limit: int = 50) -> typing.List[str]:
+    """Get the most common prefixes of recorded focused values, including the empty prefix.
+
+    Args:
+        sample: Recorded values of a focused option.
+        max_length: Longest prefix counted.
+        limit: Maximum amount of prefixes returned.
+    """
+    counter: typing.Counter[str] = collections.Counter()
+    for value in sample:
+        counter.update(value[:length] for length in range(min(len(value), max_length) + 1))
+
+    return [prefix for prefix, _ in counter.most_common(limit)]
+
+
+_SUBCOMMAND_TYPES = (hikari.OptionType.SUB_COMMAND, hikari.OptionType.SUB_COMMAND_GROUP)
+"""Types of the options of subcommands, innermost first"""
+
+
+class _WarmupInteraction:
+    """The command name and options of an autocomplete interaction"""
+
+    __slots__ = ("command_name", "guild_id", "options")
+
+    def __init__(
+        self,
+        command_name: str,
+        options: typing.Sequence[hikari.AutocompleteInteractionOption],
+        guild_id: typing.Optional[hikari.Snowflake],
+    ) -> None:
+        self.command_name = command_name
+        self.options = options
+        self.guild_id = guild_id
+
+
+class WarmupContext:
+    """A stand-in for an autocomplete context while warming up.
+
+    Only the command, the focused option, the guild and the choices are available, there is no channel or user.
+
+    Args:
+        command: Full name of the command, including subcommands separated by spaces.
+        name: Name of the focused option.
+        value: Value of the focused option.
+        guild_id: Guild the choices are warmed up for, None for choices outside of guilds.
+        option_type: Type of the focused option.
+    """
+
+    __slots__ = ("_choices", "_focused", "_guild_id", "_interaction")
+
+    def __init__(
+        self,
+        command: str,
+        name: str,
+        value: typing.Any,
+        *,
+        guild_id: typing.Optional[hikari.Snowflakeish] = None,
+        option_type: hikari.OptionType = hikari.OptionType.STRING,
+    ) -> None:
+        self._choices: typing.Optional[typing.Mapping[str, types.ChoiceValue]] = None
+        self._focused = hikari.AutocompleteInteractionOption(
+            name=name, type=option_type, value=value, options=None, is_focused=True
+        )
+        self._guild_id = None if guild_id is None else hikari.Snowflake(guild_id)
+
+        command_name, *subcommands = command.split()
+        options: typing.Sequence[hikari.AutocompleteInteractionOption] = [self._focused]
+        for subcommand, option_type in zip(reversed(subcommands), _SUBCOMMAND_TYPES):
+            options = [
+                hikari.AutocompleteInteractionOption(
+                    name=subcommand,
+                    type=option_type,
+                    value=None,
+                    options=options,  # type: ignore[arg-type] # mypy doesn't resolve hikari's Self
+                    is_focused=False,
+                )
+            ]
+
+        self._interaction = _WarmupInteraction(command_name, options, self._guild_id)
+
+    @property
+    def interaction(self) -> _WarmupInteraction:
+        return self._interaction
+
+    @property
+    def focused(self) -> hikari.AutocompleteInteractionOption:
+        return self._focused
+
+    @property
+    def options(self) -> typing.Mapping[str, hikari.AutocompleteInteractionOption]:
+        return {self._focused.name: self._focused}
+
+    @property
+    def guild_id(self) -> typing.Optional[hikari.Snowflake]:
+        return self._guild_id
+
+    @property
+    def has_responded(self) -> bool:
+        return self._choices is not None
+
+    @property
+    def choices(self) -> typing.Optional[typing.Mapping[str, types.ChoiceValue]]:
+        """The choices which were set, if any."""
+        return self._choices
+
+    async def set_choices(
+        self,
+        choices: typing.Union[
+            typing.Mapping[str, types.ChoiceValue], typing.Iterable[typing.Tuple[str, types.ChoiceValue]]
+        ] = (),
+        /,
+        **kwargs: types.ChoiceValue,
+    ) -> None:
+        if self._choices is not None:
+            raise RuntimeError("Cannot set choices after responding")
+
+        self._choices = dict(choices, **kwargs)
+
+
+@dataclasses.dataclass(frozen=True)
+class WarmupReport:
+    """Outcome of a warm-up."""
+
+    warmed: int
+    failed: typing.Mapping[typing.Tuple[str, autocompletion.Scope, str], BaseException]
+    """Exceptions keyed by the autocompleter's name, the scope and the prefix"""
+    duration: float
+
+
+class Warmup:
+    """Precompute the choices of autocompleters for common prefixes.
+
+    Choices are precomputed for a command, option and guild and only served there, but to every user
+    and whatever the other options are. Only autocompleters declared `context_independent` can be warmed up.
+    Callbacks are called with a `WarmupContext`, which has no user, and with dependencies injected
+    by the client the warm-up is installed on.
+
+    Args:
+        concurrency: Maximum amount of autocompleters running at once.
+        ttl: Seconds precomputed choices are served for, forever if None.
+    """
+
+    concurrency: int
+    ttl: typing.Optional[float]
+
+    def __init__(self, *, concurrency: int = 8, ttl: typing.Optional[float] = 300.0) -> None:
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self._targets: typing.List[
+            typing.Tuple[autocompletion.Autocompleter, autocompletion.Scope, typing.Sequence[str]]
+        ] = []
+
+    def add(
+        self,
+        autocompleter: tanjun.abc.AutocompleteCallbackSig,
+        prefixes: typing.Iterable[str],
+        *,
+        command: str,
+        option: str,
+        guild_ids: typing.Iterable[typing.Optional[hikari.Snowflakeish]],
+    ) -> Warmup:
+        """Warm up an autocompleter created by tanchi for prefixes of an option in guilds.
+
+        Args:
+            autocompleter: The autocompleter of the option.
+            prefixes: Focused values to precompute the choices of.
+            command: Full name of the command, including subcommands separated by spaces.
+            option: Name of the option.
+            guild_ids: Guilds to precompute the choices in, None for choices outside of guilds.
+
+        Raises:
+            TypeError: If the autocompleter wasn't created by tanchi.
+            ValueError: If the autocompleter isn't context independent.
+        """
+        if not isinstance(autocompleter, autocompletion.Autocompleter):
+            raise TypeError("Only autocompleters created by tanchi can be warmed up")
+        if not autocompleter.context_independent:
+            raise ValueError("Only context independent autocompleters can be warmed up")
+
+        prefixes = tuple(prefixes)
+        for guild_id in guild_ids:
+            scope = (command, option, None if guild_id is None else hikari.Snowflake(guild_id))
+            self._targets.append((autocompleter, scope, prefixes))
+
+        return self
+
+    async def _warm(
+        self,
+        autocompleter: autocompletion.Autocompleter,
+        scope: autocompletion.Scope,
+        prefix: str,
+        injector: typing.Optional[alluka.abc.Client],
+    ) -> None:
+        command, option, guild_id = scope
+        warmup_context = WarmupContext(command, option, prefix, guild_id=guild_id)
+        context = typing.cast("tanjun.abc.AutocompleteContext", warmup_context)
+        if injector is None:
+            await autocompleter.complete(context, prefix)
+        else:
+            # the wrapper has the signature of the callback, so its dependencies are injected
+            complete = functools.update_wrapper(functools.partial(autocompleter.complete), autocompleter.callback)
+            await injector.call_with_async_di(typing.cast("alluka.abc.CallbackSig[None]", complete), context, prefix)
+
+        if warmup_context.choices is not None:
+            payload = autocompletion.ChoicePayload(warmup_context.choices)
+            autocompleter.set_precomputed(scope, prefix, payload, ttl=self.ttl)
+
+    async def run(self, injector: typing.Optional[alluka.abc.Client] = None) -> WarmupReport:
+        """Warm up every autocompleter, failures are reported instead of raised.
+
+        Args:
+            injector: Injects the dependencies of the callbacks, they are called without any if None.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        failed: typing.Dict[typing.Tuple[str, autocompletion.Scope, str], BaseException] = {}
+        warmed = 0
+        start = time.perf_counter()
+
+        async def warm(autocompleter: autocompletion.Autocompleter, scope: autocompletion.Scope, prefix: str) -> None:
+            nonlocal warmed
+            async with semaphore:
+                try:
+                    await self._warm(autocompleter, scope, prefix, injector)
+                except Exception as exc:
+                    failed[(getattr(autocompleter, "__name__", repr(autocompleter)), scope, prefix)] = exc
+                else:
+                    warmed += 1
+
+        await asyncio.gather(
+            *(
+                warm(autocompleter, scope, prefix)
+                for autocompleter, scope, prefixes in self._targets
+                for prefix in prefixes
+            )
+        )
+        return WarmupReport(warmed=warmed, failed=failed, duration=time.perf_counter() - start)
+
+    def install(self, client: tanjun.abc.Client) -> None:
+        """Run the warm-up with the client's injector while it's starting, before it listens to interactions."""
+
+        async def on_starting() -> None:
+            await self.run(client.injector)
+
+        client.add_client_callback(tanjun.ClientCallbackNames.STARTING, on_starting)
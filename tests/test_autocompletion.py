@@ -1,10 +1,11 @@
+import asyncio
 from unittest import mock
 
 import hikari
 import pytest
 import tanjun
 
-from tanchi import autocompletion
+from tanchi import autocompletion, limiting, types
 
 
 @pytest.fixture
@@ -38,3 +39,207 @@ async def test_autocompletion(client: tanjun.Client):
 
     expected = [hikari.CommandChoice(name=value, value=value) for value in ("A", "B", "C", "AAAAA")]
     interaction.create_response.assert_awaited_once_with(expected)
+
+
+def make_context(client: tanjun.Client, **kwargs) -> tanjun.context.AutocompleteContext:
+    interaction = mock.AsyncMock()
+    interaction.options = [
+        hikari.AutocompleteInteractionOption(
+            name="string", type=hikari.OptionType.STRING, value="A", options=None, is_focused=True
+        )
+    ]
+    return tanjun.context.AutocompleteContext(client, interaction, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_choice_payload(client: tanjun.Client):
+    payload = autocompletion.ChoicePayload(["A", "B"])
+    autocompleter = autocompletion.as_autocomplete(lambda context, value: payload)
+
+    first, second = make_context(client), make_context(client)
+    await autocompleter(first, "A")
+    await autocompleter(second, "A")
+
+    sent = first.interaction.create_response.await_args.args[0]
+    assert sent == [hikari.CommandChoice(name="A", value="A"), hikari.CommandChoice(name="B", value="B")]
+    resent = second.interaction.create_response.await_args.args[0]
+    assert resent is not sent
+    assert all(choice is other for choice, other in zip(sent, resent))
+    assert first.has_responded
+
+
+@pytest.mark.asyncio
+async def test_choice_payload_without_tanjun_internals(client: tanjun.Client):
+    context = make_context(client)
+    del context._future
+
+    with mock.patch.object(tanjun.context.AutocompleteContext, "set_choices") as set_choices:
+        await autocompletion.ChoicePayload(["A"]).respond(context)
+
+    set_choices.assert_awaited_once_with({"A": "A"})
+
+
+@pytest.mark.asyncio
+async def test_choice_payload_future(client: tanjun.Client):
+    future = asyncio.get_running_loop().create_future()
+    context = make_context(client, future=future)
+    context.interaction.build_response = mock.Mock()
+
+    await autocompletion.ChoicePayload({"a": 1}).respond(context)
+
+    assert future.result() is context.interaction.build_response.return_value
+    context.interaction.build_response.assert_called_once_with([hikari.CommandChoice(name="a", value=1)])
+    with pytest.raises(RuntimeError):
+        await autocompletion.ChoicePayload({}).respond(context)
+
+
+@pytest.mark.asyncio
+async def test_recurring_results_are_cached(client: tanjun.Client):
+    autocompleter = autocompletion.Autocompleter(lambda context, value: [value, "B"])
+
+    first, second, other = make_context(client), make_context(client), make_context(client)
+    await autocompleter(first, "A")
+    await autocompleter(second, "A")
+    await autocompleter(other, "C")
+
+    sent = first.interaction.create_response.await_args.args[0]
+    resent = second.interaction.create_response.await_args.args[0]
+    assert all(choice is other for choice, other in zip(sent, resent))
+    assert other.interaction.create_response.await_args.args[0][0].value == "C"
+
+
+@pytest.mark.asyncio
+async def test_equal_results_of_different_types_are_not_shared(client: tanjun.Client):
+    results = iter([[1], [1.0]])
+    autocompleter = autocompletion.Autocompleter(lambda context, value: next(results))
+
+    integer, number = make_context(client), make_context(client)
+    await autocompleter(integer, "A")
+    await autocompleter(number, "A")
+
+    choice = number.interaction.create_response.await_args.args[0][0]
+    assert type(choice.value) is float
+    assert choice.name == "1.0"
+
+
+def test_choice_payload_limit():
+    with pytest.raises(ValueError):
+        autocompletion.ChoicePayload(range(26))
+
+
+def test_canonical_autocompleters():
+    def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        return [value]
+
+    limiter = limiting.ConcurrencyLimiter(total=1)
+
+    autocompleter = autocompletion.as_autocomplete(callback)
+    assert autocompletion.as_autocomplete(callback) is autocompleter
+    assert autocompletion.as_autocomplete(autocompleter) is autocompleter
+    assert types.Autocompleted(callback).autocomplete is autocompleter
+    assert autocompleter in autocompletion.registered()
+
+    limited = autocompletion.as_autocomplete(callback, limiter=limiter)
+    assert limited is not autocompleter
+    assert autocompletion.as_autocomplete(callback, limiter=limiter) is limited
+
+
+def test_shared_between_commands():
+    def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        return [value]
+
+    first = tanjun.SlashCommand(mock.Mock(), "first", "description").add_str_option("string", "cool string")
+    second = tanjun.SlashCommand(mock.Mock(), "second", "description").add_str_option("string", "cool string")
+
+    assert autocompletion.with_autocomplete(first, "string")(callback) is autocompletion.with_autocomplete(
+        second, "string"
+    )(callback)
+
+
+def make_scoped_context(command: str, guild_id: int, value: str) -> mock.Mock:
+    context = mock.Mock()
+    context.interaction.command_name = command
+    context.interaction.options = []
+    context.focused.name = "string"
+    context.focused.value = value
+    context.options = {}
+    context.guild_id = hikari.Snowflake(guild_id)
+    context.author.id = hikari.Snowflake(1)
+    context.has_responded = False
+    context.set_choices = mock.AsyncMock()
+    return context
+
+
+@pytest.mark.asyncio
+async def test_shared_caches_are_scoped():
+    release = asyncio.Event()
+    release.set()
+
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        await release.wait()
+        return [f"{context.interaction.command_name}-{context.guild_id}-{value}"]
+
+    autocompleter = autocompletion.as_autocomplete(
+        callback, limiter=limiting.ConcurrencyLimiter(total=1), context_independent=True
+    )
+    autocompleter.set_precomputed(
+        ("first", "string", hikari.Snowflake(1)), "warm", autocompletion.ChoicePayload(["warm"]), ttl=None
+    )
+    await autocompleter(make_scoped_context("first", 1, "a"), "a")
+
+    release.clear()
+    running = asyncio.create_task(autocompleter(make_scoped_context("first", 1, "b"), "b"))
+    await asyncio.sleep(0)
+
+    same, other_command, other_guild = (
+        make_scoped_context("first", 1, "a"),
+        make_scoped_context("second", 1, "a"),
+        make_scoped_context("first", 2, "a"),
+    )
+    for context in (same, other_command, other_guild):
+        await autocompleter(context, "a")
+
+    same.set_choices.assert_awaited_once_with({"first-1-a": "first-1-a"})
+    other_command.set_choices.assert_awaited_once_with({})
+    other_guild.set_choices.assert_awaited_once_with({})
+
+    release.set()
+    await running
+
+    for command, guild_id, expected in (
+        ("first", 1, "warm"),
+        ("second", 1, "second-1-warm"),
+        ("first", 2, "first-2-warm"),
+    ):
+        context = make_scoped_context(command, guild_id, "warm")
+        await autocompleter(context, "warm")
+        context.set_choices.assert_awaited_once_with({expected: expected})
+
+
+@pytest.mark.asyncio
+async def test_stats():
+    def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        if value == "fail":
+            raise ValueError(value)
+
+        return [value]
+
+    autocompleter = autocompletion.Autocompleter(callback, context_independent=True)
+    autocompleter.set_precomputed(("command", "option", None), "warm", autocompletion.ChoicePayload(["warm"]), ttl=None)
+
+    for value in ("warm", "cold", "cold", "fail"):
+        context = mock.Mock()
+        context.interaction.command_name = "command"
+        context.interaction.options = []
+        context.focused.name = "option"
+        context.guild_id = None
+        context.has_responded = False
+        context.focused.value = value
+        context.set_choices = mock.AsyncMock()
+        if value == "fail":
+            with pytest.raises(ValueError):
+                await autocompleter(context, value)
+        else:
+            await autocompleter(context, value)
+
+    assert autocompleter.stats == {"precomputed": 1, "completed": 2, "failed": 1}
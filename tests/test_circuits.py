@@ -0,0 +1,209 @@
+import asyncio
+from unittest import mock
+
+import hikari
+import pytest
+
+from tanchi import autocompletion, circuits, metrics
+
+
+class Backend:
+    def __init__(self) -> None:
+        self.failing = False
+        self.calls = 0
+
+    async def __call__(self, value: str) -> str:
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError(value)
+        if value == "invalid":
+            raise ValueError(value)
+        if value == "slow":
+            await asyncio.sleep(1)
+
+        return value
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.HistogramSink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+@pytest.mark.asyncio
+async def test_opens_and_recovers(sink: metrics.HistogramSink):
+    backend = Backend()
+    breaker = circuits.CircuitBreaker("backend", failure_threshold=2, recovery_time=0.05, trials=2)
+
+    backend.failing = True
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(backend, "value")
+
+    assert breaker.state == circuits.OPEN
+    with pytest.raises(circuits.CircuitOpenError):
+        await breaker.call(backend, "value")
+    assert backend.calls == 2
+
+    await asyncio.sleep(0.05)
+    assert breaker.state == circuits.HALF_OPEN
+
+    # a failed trial opens the breaker again
+    with pytest.raises(ConnectionError):
+        await breaker.call(backend, "value")
+    assert breaker.state == circuits.OPEN
+
+    await asyncio.sleep(0.05)
+    backend.failing = False
+    assert await breaker.call(backend, "a") == "a"
+    assert breaker.state == circuits.HALF_OPEN
+    assert await breaker.call(backend, "b") == "b"
+    assert breaker.state == circuits.CLOSED
+
+    assert breaker.transitions == {"open": 2, "half_open": 2, "closed": 1}
+    assert sink.get("circuit.open", "backend").count == 2
+    assert sink.get("circuit.closed", "backend").count == 1
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_ignored_errors():
+    breaker = circuits.CircuitBreaker(timeout=0.01, failure_threshold=2)
+    backend = Backend()
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await breaker.call(backend, "invalid")
+    assert breaker.state == circuits.CLOSED
+
+    for _ in range(2):
+        with pytest.raises(circuits.CircuitTimeoutError):
+            await breaker.call(backend, "slow")
+    assert breaker.state == circuits.OPEN
+
+
+@pytest.mark.asyncio
+async def test_ignored_errors_are_not_trials():
+    breaker = circuits.CircuitBreaker(failure_threshold=1, recovery_time=0)
+    backend = Backend()
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(mock.Mock(side_effect=ConnectionError))
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await breaker.call(backend, "invalid")
+        assert breaker.state == circuits.HALF_OPEN
+
+    assert await breaker.call(backend, "value") == "value"
+    assert breaker.state == circuits.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_single_trial_at_a_time():
+    breaker = circuits.CircuitBreaker(failure_threshold=1, recovery_time=0)
+    release = asyncio.Event()
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(mock.Mock(side_effect=ConnectionError))
+
+    trial = asyncio.create_task(breaker.call(release.wait))
+    await asyncio.sleep(0)
+    with pytest.raises(circuits.CircuitOpenError):
+        await breaker.call(release.wait)
+
+    release.set()
+    await trial
+    assert breaker.state == circuits.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_calls_from_before_a_transition_are_ignored():
+    breaker = circuits.CircuitBreaker(failure_threshold=1, recovery_time=0)
+    release = asyncio.Event()
+
+    async def fail_later() -> None:
+        await release.wait()
+        raise ConnectionError
+
+    stale = asyncio.create_task(breaker.call(fail_later))
+    await asyncio.sleep(0)
+    with pytest.raises(ConnectionError):
+        await breaker.call(mock.Mock(side_effect=ConnectionError))
+    assert breaker.state == circuits.HALF_OPEN
+
+    # the call started while the breaker was closed, it doesn't fail the trial period
+    release.set()
+    with pytest.raises(ConnectionError):
+        await stale
+    assert breaker.state == circuits.HALF_OPEN
+    assert breaker.transitions == {"open": 1, "half_open": 1}
+
+
+@pytest.mark.asyncio
+async def test_circuit_errors_are_not_ignored():
+    inner = circuits.CircuitBreaker("inner", failure_threshold=1)
+    outer = circuits.CircuitBreaker("outer", failure_threshold=2)
+
+    with pytest.raises(ConnectionError):
+        await inner.call(mock.Mock(side_effect=ConnectionError))
+
+    for _ in range(2):
+        with pytest.raises(circuits.CircuitOpenError):
+            await outer.call(inner.call, mock.Mock())
+
+    assert outer.state == circuits.OPEN
+
+
+@pytest.mark.asyncio
+async def test_protect():
+    breaker = circuits.CircuitBreaker(failure_threshold=1)
+    backend = Backend()
+    converter = breaker.protect(backend)
+
+    assert await converter("value") == "value"
+    backend.failing = True
+    with pytest.raises(ConnectionError):
+        await converter("value")
+
+    # open breakers raise value errors, so tanjun treats them as failed conversions
+    with pytest.raises(ValueError):
+        await converter("value")
+
+
+@pytest.mark.asyncio
+async def test_autocompleter_fallback():
+    backend = Backend()
+
+    async def callback(context, value: str):
+        return [await backend(value)]
+
+    breaker = circuits.CircuitBreaker(failure_threshold=1)
+    autocompleter = autocompletion.Autocompleter(callback, breaker=breaker)
+
+    def make_context(value: str) -> mock.Mock:
+        context = mock.Mock()
+        context.interaction.command_name = "command"
+        context.interaction.options = []
+        context.guild_id = None
+        context.author.id = hikari.Snowflake(1)
+        context.options = {}
+        context.focused.name = "option"
+        context.has_responded = False
+        context.focused.value = value
+        context.set_choices = mock.AsyncMock()
+        return context
+
+    await autocompleter(make_context("a"), "a")
+    backend.failing = True
+    with pytest.raises(ConnectionError):
+        await autocompleter(make_context("b"), "b")
+
+    cached, empty = make_context("a"), make_context("b")
+    await autocompleter(cached, "a")
+    await autocompleter(empty, "b")
+
+    cached.set_choices.assert_awaited_once_with({"a": "a"})
+    empty.set_choices.assert_awaited_once_with({})
+    assert autocompleter.stats == {"completed": 1, "failed": 1, "broken": 2}
@@ -71,7 +71,7 @@ def test_as_slash_command():
         type=hikari.OptionType.CHANNEL,
         name="channel",
         description="A text or news channel, very cool!",
-        channel_types=[hikari.ChannelType.GUILD_TEXT, hikari.ChannelType.GUILD_NEWS],
+        channel_types=(hikari.ChannelType.GUILD_TEXT, hikari.ChannelType.GUILD_NEWS),
     )
     assert builder.options[4] == hikari.CommandOption(
         type=hikari.OptionType.ROLE,
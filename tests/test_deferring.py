@@ -0,0 +1,118 @@
+import asyncio
+from unittest import mock
+
+import pytest
+import tanjun
+
+from tanchi import commands, deferring
+
+
+def make_context() -> tanjun.context.SlashContext:
+    return tanjun.context.SlashContext(mock.Mock(), mock.AsyncMock(), mock.Mock())
+
+
+async def sleep_for(duration: float) -> None:
+    await asyncio.sleep(duration)
+
+
+def test_estimate():
+    defer = deferring.AdaptiveDefer()
+    assert defer.predict("command") is None
+
+    for _ in range(10):
+        defer.observe("command", 1.0)
+
+    predicted = defer.predict("command")
+    assert predicted and 1.0 <= predicted < 1.2
+
+
+@pytest.mark.asyncio
+async def test_fast_command_is_not_deferred():
+    defer = deferring.AdaptiveDefer(deadline=0.05)
+    context = make_context()
+
+    await defer.run("command", context, sleep_for, 0)
+    await asyncio.sleep(0.1)
+
+    assert not context.has_been_deferred
+    assert defer.decisions[("command", "skipped")] == 1
+
+
+@pytest.mark.asyncio
+async def test_timer_defers():
+    defer = deferring.AdaptiveDefer(deadline=0.01)
+    context = make_context()
+
+    await defer.run("command", context, sleep_for, 0.05)
+
+    assert context.has_been_deferred
+    context.interaction.create_initial_response.assert_awaited_once()
+    assert defer.decisions[("command", "watchdog")] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_timer_is_kept():
+    defer = deferring.AdaptiveDefer(deadline=10)
+    context = make_context().start_defer_timer(0.01)
+
+    await defer.run("command", context, sleep_for, 0.05)
+
+    assert context.has_been_deferred
+    assert defer.decisions[("command", "watchdog")] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_defer_is_not_raised_into_the_command():
+    defer = deferring.AdaptiveDefer(deadline=0.01)
+    context = make_context()
+    context.interaction.create_initial_response.side_effect = RuntimeError("rejected")
+
+    async def command() -> str:
+        await asyncio.sleep(0.05)
+        return "done"
+
+    assert await defer.run("command", context, command) == "done"
+
+
+@pytest.mark.asyncio
+async def test_response_cancels_timer():
+    defer = deferring.AdaptiveDefer(deadline=0.01)
+    context = make_context()
+
+    async def command() -> None:
+        await context.respond("content")
+        await asyncio.sleep(0.05)
+
+    await defer.run("command", context, command)
+
+    assert not context.has_been_deferred
+    context.interaction.create_initial_response.assert_awaited_once()
+    assert defer.decisions[("command", "skipped")] == 1
+
+
+@pytest.mark.asyncio
+async def test_predicted_defer():
+    defer = deferring.AdaptiveDefer(threshold=1)
+    defer.observe("command", 2)
+    context = make_context()
+
+    await defer.run("command", context, sleep_for, 0)
+
+    assert context.has_been_deferred
+    assert defer.decisions[("command", "predicted")] == 1
+
+
+@pytest.mark.asyncio
+async def test_command_adaptive_defer():
+    defer = deferring.AdaptiveDefer(threshold=0)
+    defer.observe("command", 1)
+
+    @commands.as_slash_command(adaptive_defer=defer)
+    async def command(context: tanjun.abc.SlashContext):
+        """Command description."""
+
+    context = mock.AsyncMock(has_responded=False, has_been_deferred=False)
+    context.set_command = mock.Mock(return_value=context)
+    await command.execute(context)
+
+    context.defer.assert_awaited_once()
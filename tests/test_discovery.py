@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from tanchi import discovery
+
+SOURCE = '''
+import tanchi
+import tanjun
+from tanchi import as_slash_command as command
+from tanchi import commands
+
+
+@tanchi.as_slash_command()
+async def first(context: tanjun.abc.SlashContext):
+    """First command."""
+
+
+@command("renamed")
+async def second(context: tanjun.abc.SlashContext):
+    """Second command."""
+
+
+@commands.as_slash_command(name=NAME)
+async def third(context: tanjun.abc.SlashContext):
+    """Third command."""
+
+
+@tanjun.as_slash_command("other", "Not a tanchi command.")
+async def other(context: tanjun.abc.SlashContext):
+    ...
+'''
+
+
+def test_scan_source():
+    locations = discovery.scan_source(SOURCE, "module")
+
+    assert [(location.name, location.function) for location in locations] == [
+        ("first", "first"),
+        ("renamed", "second"),
+        (None, "third"),
+    ]
+    assert locations[0].lineno == 9
+
+
+def test_scan_without_tanchi():
+    assert discovery.scan_source("import tanjun\n\n@tanjun.as_slash_command('a', 'b')\nasync def a(c): ...", "m") == []
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+
+    root = tmp_path / "discovered"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "light.py").write_text(textwrap.dedent('''
+            import tanchi
+
+            @tanchi.as_slash_command()
+            async def light(context):
+                """Light command."""
+            '''))
+    (root / "heavy.py").write_text(textwrap.dedent('''
+            import tanchi
+            import discovered_missing_dependency
+
+            @tanchi.as_slash_command()
+            async def heavy(context):
+                """Heavy command."""
+            '''))
+
+    yield tmp_path
+    for name in list(sys.modules):
+        if name.startswith("discovered"):
+            del sys.modules[name]
+
+
+def test_manifest(package):
+    cache = package / "manifest.json"
+    manifest = discovery.Manifest(cache).scan(package)
+
+    assert {(location.name, location.module) for location in manifest.commands} == {
+        ("heavy", "discovered.heavy"),
+        ("light", "discovered.light"),
+    }
+    assert manifest.modules_for(["light"]) == ["discovered.light"]
+
+    commands = manifest.import_commands(["light"])
+    assert commands["light"].name == "light"
+    assert "discovered.heavy" not in sys.modules
+
+    with pytest.raises(LookupError):
+        manifest.import_commands(["missing"])
+
+
+def test_manifest_cache(package, monkeypatch):
+    cache = package / "manifest.json"
+    discovery.Manifest(cache).scan(package)
+
+    scanned = []
+    original = discovery.scan_file
+    monkeypatch.setattr(discovery, "scan_file", lambda path, module: scanned.append(module) or original(path, module))
+
+    light = package / "discovered" / "light.py"
+    light.write_text(light.read_text().replace("light(context)", "lighter(context)") + "\n")
+    os.utime(light, ns=(1, 1))
+    (package / "discovered" / "heavy.py").unlink()
+
+    manifest = discovery.Manifest(cache).scan(package)
+
+    assert scanned == ["discovered.light"]
+    assert [location.name for location in manifest.commands] == ["lighter"]
+
+
+def test_scan_does_not_import_dependencies(package):
+    code = (
+        "import sys, tanchi.discovery;"
+        f"tanchi.discovery.Manifest().scan({str(package)!r});"
+        "assert not {'hikari', 'tanjun'} & set(sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+
+import tanchi
+from tanchi import commands, types
+
+IMPORT_TIME_BUDGET = 0.05
+"""Cumulative seconds `import tanchi` may take"""
+
+
+def run_python(*args: str) -> str:
+    process = subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+    return process.stderr
+
+
+def test_import_does_not_load_dependencies():
+    code = "import sys, tanchi; assert not {'hikari', 'tanjun', 'alluka'} & set(sys.modules)"
+    run_python("-c", code)
+
+
+@pytest.mark.parametrize("module", ["autocompletion", "types", "slash", "discovery"])
+def test_submodule_imported_first(module: str):
+    run_python("-c", f"import tanchi.{module}")
+
+
+def test_import_time():
+    output = run_python("-X", "importtime", "-c", "import tanchi")
+
+    for line in output.splitlines():
+        _, _, cumulative, package = [x.strip() for x in line.replace(":", "|", 1).split("|")]
+        if package == "tanchi":
+            break
+    else:
+        pytest.fail("tanchi was not imported")
+
+    assert int(cumulative) / 1_000_000 < IMPORT_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    assert tanchi.as_slash_command is commands.as_slash_command
+    assert tanchi.Range is types.Range
+    assert tanchi.parser.create_command
+
+    assert "as_autocomplete" in dir(tanchi)
+
+    with pytest.raises(AttributeError):
+        tanchi.missing
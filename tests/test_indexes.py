@@ -0,0 +1,77 @@
+import multiprocessing
+import tracemalloc
+
+import pytest
+
+from tanchi import autocompletion, indexes, types
+
+WORDS = ["Apple", "apricot", "Banana", "blueberry", "Éclair", "apple", "Apple", "cherry"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    indexes.build_index(WORDS, tmp_path / "words.index")
+    with indexes.ChoiceIndex(tmp_path / "words.index") as index:
+        yield index
+
+
+def test_search(index: indexes.ChoiceIndex):
+    assert len(index) == 7
+    assert index.search("ap") == ["Apple", "apple", "apricot"]
+    assert index.search("APP") == ["Apple", "apple"]
+    assert index.search("b") == ["Banana", "blueberry"]
+    assert index.search("éc") == ["Éclair"]
+    assert index.search("z") == []
+    assert index.search("") == sorted(set(WORDS), key=lambda word: (word.casefold().encode(), word.encode()))
+    assert index.search("", limit=2) == ["Apple", "apple"]
+
+
+def test_empty_index(tmp_path):
+    indexes.build_index([], tmp_path / "empty.index")
+
+    with indexes.ChoiceIndex(tmp_path / "empty.index") as index:
+        assert index.search("") == []
+
+
+def test_invalid_file(tmp_path):
+    (tmp_path / "invalid.index").write_bytes(b"not an index at all")
+
+    with pytest.raises(ValueError):
+        indexes.ChoiceIndex(tmp_path / "invalid.index")
+
+
+def test_search_allocations(index: indexes.ChoiceIndex):
+    index.search("ap")
+    tracemalloc.start()
+    try:
+        index.search("ap")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # only the results and small temporaries, nothing proportional to the index
+    assert peak < 2048
+
+
+@pytest.mark.asyncio
+async def test_autocompleted(index: indexes.ChoiceIndex):
+    autocompleted = types.Autocompleted(index)
+    assert isinstance(autocompleted.autocomplete, autocompletion.Autocompleter)
+    assert autocompleted.autocomplete.callback is index
+
+
+def _search_in_worker(path, prefix, queue):
+    with indexes.ChoiceIndex(path) as index:
+        queue.put(index.search(prefix))
+
+
+def test_shared_between_processes(tmp_path):
+    indexes.build_index(WORDS, tmp_path / "words.index")
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+
+    process = context.Process(target=_search_in_worker, args=(tmp_path / "words.index", "bl", queue))
+    process.start()
+    process.join(30)
+
+    assert queue.get(timeout=5) == ["blueberry"]
@@ -0,0 +1,115 @@
+import typing
+from unittest import mock
+
+import hikari
+import pytest
+import tanjun
+
+from tanchi import commands, invoking, metrics, parser, types
+
+
+@commands.as_slash_command()
+async def command(
+    context: tanjun.abc.SlashContext,
+    string: str,
+    number: float,
+    member: hikari.Member,
+    channel: typing.Optional[hikari.GuildTextChannel] = None,
+    converted: types.Converted[int] = 0,
+    multiple: types.Converted[int, float] = 0,
+):
+    """Command description."""
+
+
+def make_context(**options: typing.Any) -> mock.Mock:
+    async def call_with_async_di(callback, *args, **kwargs):
+        return callback(*args, **kwargs)
+
+    context = mock.Mock()
+    context.call_with_async_di.side_effect = call_with_async_di
+    context.options = options
+    return context
+
+
+def make_option(option_type: hikari.OptionType, value: typing.Any) -> mock.Mock:
+    return mock.Mock(type=option_type, value=value)
+
+
+@pytest.mark.asyncio
+async def test_invoker_matches_tanjun():
+    member = make_option(hikari.OptionType.USER, 1)
+    context = make_context(
+        string=make_option(hikari.OptionType.STRING, "string"),
+        number=make_option(hikari.OptionType.FLOAT, 1),
+        member=member,
+        converted=make_option(hikari.OptionType.STRING, "42"),
+        multiple=make_option(hikari.OptionType.STRING, "4.2"),
+    )
+
+    generic = await tanjun.SlashCommand._process_args(command, context)
+    specialized = await command._process_args(context)
+
+    assert specialized == generic
+    assert specialized["member"] is member.resolve_to_member.return_value
+    assert specialized["channel"] is None
+    assert specialized["multiple"] == 4.2
+
+
+@pytest.mark.asyncio
+async def test_invoker_errors():
+    context = make_context()
+    with pytest.raises(RuntimeError):
+        await command._process_args(context)
+
+    member = make_option(hikari.OptionType.USER, 1)
+    member.resolve_to_member.return_value = None
+    context = make_context(
+        string=make_option(hikari.OptionType.STRING, "string"),
+        number=make_option(hikari.OptionType.FLOAT, 1),
+        member=member,
+    )
+    with pytest.raises(tanjun.ConversionError):
+        await command._process_args(context)
+
+    context.options["member"] = make_option(hikari.OptionType.USER, 1)
+    context.options["converted"] = make_option(hikari.OptionType.STRING, "not a number")
+    with pytest.raises(tanjun.ConversionError):
+        await command._process_args(context)
+
+
+@pytest.mark.asyncio
+async def test_invoker_records_converters():
+    context = make_context(
+        string=make_option(hikari.OptionType.STRING, "string"),
+        number=make_option(hikari.OptionType.FLOAT, 1),
+        member=make_option(hikari.OptionType.USER, 1),
+        converted=make_option(hikari.OptionType.STRING, "42"),
+    )
+    sink = metrics.HistogramSink()
+    metrics.set_sink(sink)
+    try:
+        with mock.patch.object(tanjun.SlashCommand, "_process_args") as generic:
+            arguments = await command._process_args(context)
+    finally:
+        metrics.set_sink(None)
+
+    generic.assert_not_called()
+    assert arguments["converted"] == 42
+    assert sink.get("converter", "command.converted")
+
+
+def test_invoker_removed_on_new_option():
+    @commands.as_slash_command(validate_arg_keys=False)
+    async def command(context: tanjun.abc.SlashContext, string: str):
+        """Command description."""
+
+    assert command._invoker
+    command.add_str_option("other", "Other option")
+    assert command._invoker is None
+
+
+def test_build_invoker_source():
+    option = parser.Option("option", "-", hikari.OptionType.STRING, default=None)
+    invoker = invoking.build_invoker([option])
+
+    assert "d0" in invoker.__source__  # type: ignore[attr-defined]
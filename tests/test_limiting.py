@@ -0,0 +1,129 @@
+import asyncio
+from unittest import mock
+
+import hikari
+import pytest
+import tanjun
+
+from tanchi import autocompletion, limiting
+
+
+def make_context(value: str, *, guild_id: int = 1, user_id: int = 1, option: str = "option") -> mock.Mock:
+    context = mock.Mock()
+    context.interaction.command_name = "command"
+    context.interaction.options = []
+    context.focused.name = option
+    context.options = {}
+    context.guild_id = hikari.Snowflake(guild_id)
+    context.author.id = hikari.Snowflake(user_id)
+    context.has_responded = False
+    context.focused.value = value
+    context.set_choices = mock.AsyncMock()
+    return context
+
+
+def test_limits():
+    limiter = limiting.ConcurrencyLimiter(total=3, per_guild=2, per_user=1)
+
+    assert limiter.try_acquire(make_context("", user_id=1))
+    assert not limiter.try_acquire(make_context("", user_id=1))
+    assert limiter.try_acquire(make_context("", user_id=2))
+    assert not limiter.try_acquire(make_context("", user_id=3))
+    assert limiter.try_acquire(make_context("", guild_id=2, user_id=3))
+    assert not limiter.try_acquire(make_context("", guild_id=3, user_id=4))
+
+    assert limiter.active == 3
+    assert limiter.shed == {"user": 1, "guild": 1, "total": 1}
+
+    limiter.release(make_context("", user_id=1))
+    assert limiter.try_acquire(make_context("", user_id=1))
+
+
+@pytest.mark.asyncio
+async def test_shed_with_fallback():
+    release = asyncio.Event()
+
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        await release.wait()
+        return [value]
+
+    limiter = limiting.ConcurrencyLimiter(per_user=1)
+    autocompleter = autocompletion.as_autocomplete(callback, limiter=limiter)
+
+    release.set()
+    first = make_context("a")
+    await autocompleter(first, "a")
+    first.set_choices.assert_awaited_once_with({"a": "a"})
+
+    release.clear()
+    running = asyncio.create_task(autocompleter(make_context("b"), "b"))
+    await asyncio.sleep(0)
+
+    cached, empty = make_context("a"), make_context("c")
+    await autocompleter(cached, "a")
+    await autocompleter(empty, "c")
+
+    cached.set_choices.assert_awaited_once_with({"a": "a"})
+    empty.set_choices.assert_awaited_once_with({})
+    assert limiter.shed == {"user": 2}
+
+    release.set()
+    await running
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_fallback_is_scoped():
+    release = asyncio.Event()
+    release.set()
+
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        await release.wait()
+        return [f"{context.guild_id}-{value}"]
+
+    limiter = limiting.ConcurrencyLimiter(total=1)
+    autocompleter = autocompletion.as_autocomplete(callback, limiter=limiter)
+    await autocompleter(make_context("a", guild_id=1, option="tag"), "a")
+
+    release.clear()
+    running = asyncio.create_task(autocompleter(make_context("b"), "b"))
+    await asyncio.sleep(0)
+
+    other_guild, other_option = make_context("a", guild_id=2, option="tag"), make_context("a", option="item")
+    await autocompleter(other_guild, "a")
+    await autocompleter(other_option, "a")
+
+    other_guild.set_choices.assert_awaited_once_with({})
+    other_option.set_choices.assert_awaited_once_with({})
+
+    release.set()
+    await running
+
+
+@pytest.mark.asyncio
+async def test_fallback_is_per_user_and_options():
+    release = asyncio.Event()
+    release.set()
+
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        await release.wait()
+        return [f"{context.author.id}-{value}"]
+
+    autocompleter = autocompletion.as_autocomplete(callback, limiter=limiting.ConcurrencyLimiter(total=1))
+    await autocompleter(make_context("a", user_id=1), "a")
+
+    release.clear()
+    running = asyncio.create_task(autocompleter(make_context("b"), "b"))
+    await asyncio.sleep(0)
+
+    same, other_user, other_options = make_context("a", user_id=1), make_context("a", user_id=2), make_context("a")
+    other_options.options = {"folder": mock.Mock(value="private")}
+    for context in (same, other_user, other_options):
+        await autocompleter(context, "a")
+
+    same.set_choices.assert_awaited_once_with({"1-a": "1-a"})
+    other_user.set_choices.assert_awaited_once_with({})
+    other_options.set_choices.assert_awaited_once_with({})
+
+    release.set()
+    await running
@@ -0,0 +1,93 @@
+import typing
+
+import hikari
+import pytest
+import tanjun
+
+from tanchi import loadtesting, metrics, parser, types
+
+
+def words(context: tanjun.abc.AutocompleteContext, value: str):
+    return [word for word in ("apple", "banana", "cherry") if value in word]
+
+
+async def fruit(
+    context: tanjun.abc.SlashContext,
+    name: types.Autocompleted[words],
+    count: types.Range[1, 10] = 1,
+    user: typing.Optional[hikari.User] = None,
+) -> None:
+    """Fruit.
+
+    Args:
+        name: Name of the fruit.
+        count: Amount of fruit.
+        user: Who gets the fruit.
+    """
+    if name == "fail":
+        raise RuntimeError(name)
+
+    await context.respond(f"{name} x{count} for {user and user.mention}")
+
+
+@pytest.fixture
+def command():
+    return parser.create_command(fruit)
+
+
+def test_synthesize(command):
+    interactions = loadtesting.synthesize([command], 200, seed=0)
+
+    assert {interaction.command for interaction in interactions} == {"fruit"}
+    assert all("name" in interaction.options for interaction in interactions)
+    assert {interaction.focused for interaction in interactions} == {None, "name"}
+    assert all(1 <= interaction.options.get("count", 1) <= 10 for interaction in interactions)
+    assert interactions == loadtesting.synthesize([command], 200, seed=0)
+
+
+def test_recording(tmp_path):
+    interactions = [
+        loadtesting.Interaction("fruit", {"name": "apple", "count": 2}, guild_id=1),
+        loadtesting.Interaction("fruit", {"name": "a"}, focused="name"),
+    ]
+
+    loadtesting.dump_interactions(interactions, tmp_path / "recording.jsonl")
+
+    assert loadtesting.load_interactions(tmp_path / "recording.jsonl") == interactions
+
+
+@pytest.mark.asyncio
+async def test_run_load(command):
+    interactions = [
+        loadtesting.Interaction("fruit", {"name": "apple", "user": 123}),
+        loadtesting.Interaction("fruit", {"name": "fail"}),
+        loadtesting.Interaction("fruit", {"name": "an"}, focused="name"),
+    ]
+    rest = loadtesting.FakeRest()
+
+    report = await loadtesting.run_load([command], interactions, rate=1000, total=30, rest=rest)
+
+    assert report.sent == 30
+    assert report.failed == 10
+    assert report.throughput > 0
+    assert report.histograms[("load.slash", "fruit")].count == 20
+    assert report.histograms[("load.autocomplete", "fruit.name")].count == 10
+    assert ("invocation", "fruit") in report.histograms
+    assert report.rest_calls == {"create_initial_response": 10, "create_autocomplete_response": 10}
+    assert "load.slash" in report.format()
+
+
+@pytest.mark.asyncio
+async def test_run_load_keeps_sink(command):
+    sink = metrics.HistogramSink()
+    metrics.set_sink(sink)
+    try:
+        report = await loadtesting.run_load([command], [loadtesting.Interaction("fruit", {"name": "apple"})], rate=1000)
+        assert metrics.get_sink() is sink
+    finally:
+        metrics.set_sink(None)
+
+    assert report.histograms[("invocation", "fruit")].count == 1
+    invocation = sink.get("invocation", "fruit")
+    assert invocation and invocation.count == 1
+    assert sink.get("load.slash", "fruit") is None
@@ -0,0 +1,96 @@
+import enum
+import typing
+from unittest import mock
+
+import pytest
+import tanjun
+
+from tanchi import commands, messages, types
+
+
+class Color(enum.Enum):
+    red = "RED"
+    blue = "BLUE"
+
+
+@commands.as_message_command("command", "alias")
+async def command(
+    context: tanjun.abc.MessageContext,
+    text: str,
+    number: types.Range[1, 10],
+    choice: typing.Literal["foo", "bar"],
+    color: Color = Color.red,
+    ratio: float = 0.5,
+    converted: types.Converted[int] = 0,
+):
+    """Command description."""
+
+
+def make_context(content: str) -> mock.Mock:
+    async def call_with_async_di(callback, *args, **kwargs):
+        return callback(*args, **kwargs)
+
+    context = mock.Mock(content=content)
+    context.call_with_async_di.side_effect = call_with_async_di
+    return context
+
+
+def test_tokenize():
+    assert messages.tokenize('a "b c" \'d \\\' e\' "f \\" g"') == ["a", "b c", "d ' e", 'f " g']
+    assert messages.tokenize("a b c", 2) == ["a", "b"]
+
+
+def test_message_command():
+    assert list(command.names) == ["command", "alias"]
+    assert isinstance(command.parser, messages.CompiledParser)
+    assert command.parser.usage == "<text> <number> <choice> [color] [ratio] [converted]"
+
+
+@pytest.mark.asyncio
+async def test_parse():
+    assert command.parser
+    kwargs = await command.parser.parse(make_context('"hello world" 5 FOO blue 1.5 42'))
+    assert kwargs == {
+        "text": "hello world",
+        "number": 5,
+        "choice": "foo",
+        "color": Color.blue,
+        "ratio": 1.5,
+        "converted": 42,
+    }
+
+    kwargs = await command.parser.parse(make_context("hello 5 bar RED"))
+    assert kwargs["color"] is Color.red and kwargs["ratio"] == 0.5
+
+    kwargs = await command.parser.parse(make_context("hello 5 bar"))
+    assert kwargs["color"] is Color.red
+
+
+@pytest.mark.asyncio
+async def test_command_without_arguments_ignores_text():
+    @commands.as_message_command("ping")
+    async def ping(context: tanjun.abc.MessageContext):
+        """Command description."""
+
+    assert ping.parser
+    assert await ping.parser.parse(make_context("trailing text")) == {}
+
+
+@pytest.mark.asyncio
+async def test_parse_errors():
+    assert command.parser
+
+    with pytest.raises(tanjun.NotEnoughArgumentsError):
+        await command.parser.parse(make_context("hello 5"))
+
+    with pytest.raises(tanjun.TooManyArgumentsError):
+        await command.parser.parse(make_context("hello 5 foo red 1 2 3"))
+
+    with pytest.raises(tanjun.ConversionError):
+        await command.parser.parse(make_context("hello 11 foo"))
+
+    with pytest.raises(tanjun.ConversionError):
+        await command.parser.parse(make_context("hello 5 baz"))
+
+    with pytest.raises(tanjun.ConversionError):
+        await command.parser.parse(make_context("hello five foo"))
@@ -0,0 +1,99 @@
+import inspect
+from unittest import mock
+
+import hikari
+import pytest
+import tanjun
+
+from tanchi import commands, metrics, types
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.HistogramSink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+def test_histogram():
+    histogram = metrics.Histogram()
+    for duration in (0.001, 0.002, 0.003, 0.1):
+        histogram.add(duration)
+    histogram.add(1, failed=True)
+
+    assert histogram.count == 5 and histogram.failures == 1
+    assert histogram.min == 0.001 and histogram.max == 1
+    assert 0.002 <= histogram.percentile(50) <= 0.005
+    assert histogram.percentile(100) == 1
+
+
+def test_disabled_by_default():
+    assert metrics.get_sink() is None
+
+
+@pytest.mark.asyncio
+async def test_command_metrics(sink: metrics.HistogramSink):
+    @commands.as_slash_command()
+    async def command(context: tanjun.abc.SlashContext, number: types.Converted[int]):
+        """Command description."""
+
+    parse = sink.get("parse", "command")
+    assert parse and parse.count == 1
+
+    async def call_with_async_di(callback, *args, **kwargs):
+        result = callback(*args, **kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    context = mock.AsyncMock()
+    context.call_with_async_di.side_effect = call_with_async_di
+
+    assert await command._tracked_options["number"].convert(context, "1") == 1
+    with pytest.raises(tanjun.ConversionError):
+        await command._tracked_options["number"].convert(context, "one")
+
+    converter = sink.get("converter", "command.number")
+    assert converter and converter.count == 2 and converter.failures == 1
+
+    context.set_command = mock.Mock(return_value=context)
+    context.options = {"number": mock.Mock(type=hikari.OptionType.STRING, value="1")}
+    await command.execute(context)
+
+    invocation = sink.get("invocation", "command")
+    assert invocation and invocation.count == 1
+
+
+def test_collect(sink: metrics.HistogramSink):
+    local = metrics.HistogramSink()
+    with metrics.collect(local):
+        metrics.get_sink().record("invocation", "command", 0.1)
+
+    assert metrics.get_sink() is sink
+    assert sink.get("invocation", "command") and local.get("invocation", "command")
+
+
+@pytest.mark.asyncio
+async def test_subcommands_are_named_with_their_group(sink: metrics.HistogramSink):
+    async def call_with_async_di(callback, *args, **kwargs):
+        result = callback(*args, **kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    for group in ("first", "second"):
+
+        @commands.as_slash_command()
+        async def command(context: tanjun.abc.SlashContext, number: types.Converted[int]):
+            """Command description."""
+
+        tanjun.slash_command_group(group, "Group.").add_command(command)
+
+        context = mock.AsyncMock()
+        context.call_with_async_di.side_effect = call_with_async_di
+        context.set_command = mock.Mock(return_value=context)
+        context.options = {"number": mock.Mock(type=hikari.OptionType.STRING, value="1")}
+        await command.execute(context)
+
+    for group in ("first", "second"):
+        invocation = sink.get("invocation", f"{group} command")
+        converter = sink.get("converter", f"{group} command.number")
+        assert invocation and invocation.count == 1
+        assert converter and converter.count == 1
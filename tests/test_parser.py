@@ -1,3 +1,4 @@
+import dataclasses
 import enum
 import functools
 import typing
@@ -120,7 +121,54 @@ def test_parse_parameter_with_channel():
     option = parse_parameter(typing.Union[hikari.GuildVoiceChannel, hikari.GuildStageChannel])
 
     assert option.option_type == hikari.OptionType.CHANNEL
-    assert option.channel_types == [hikari.ChannelType.GUILD_VOICE, hikari.ChannelType.GUILD_STAGE]
+    assert option.channel_types == (hikari.ChannelType.GUILD_VOICE, hikari.ChannelType.GUILD_STAGE)
+
+
+def test_parse_parameter_is_frozen():
+    option = parse_parameter(hikari.Member, name="user")
+
+    assert parse_parameter(hikari.User, name="user") != option
+    assert hash(parse_parameter(typing.Optional[hikari.Member], name="user")) == hash(option)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        option.name = "member"  # type: ignore[misc]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        option.unknown = "member"  # type: ignore[attr-defined]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del option.name
+
+    assert not hasattr(option, "__dict__")
+
+
+def test_parse_parameter_shares_channel_types():
+    a = parse_parameter(hikari.GuildTextChannel, name="a")
+    b = parse_parameter(hikari.GuildTextChannel, name="b")
+
+    assert a is not b
+    assert a.channel_types is b.channel_types
+
+
+def test_equal_defaults_of_different_types_are_not_shared():
+    assert parser.parse_parameter("option", float, 1).default == 1
+    assert type(parser.parse_parameter("option", float, 1.0).default) is float
+
+    assert parser.parse_parameter("option", str, 0).default == 0
+    assert parser.parse_parameter("option", str, False).default is False
+
+
+def test_equal_choices_of_different_types_are_not_shared():
+    a = parser.Option("a", "description", hikari.OptionType.FLOAT, choices={"one": 1})
+    b = parser.Option("a", "description", hikari.OptionType.FLOAT, choices={"one": 1.0})
+
+    assert b.choices is not None and type(b.choices["one"]) is float
+    assert a.choices is not b.choices and hash(a) != hash(b)
+
+
+def test_interned_values_are_bounded():
+    for index in range(parser._INTERNED_VALUES_SIZE + 10):
+        parser.Option("option", "description", hikari.OptionType.STRING, choices={str(index): str(index)})
+
+    assert len(parser._interned_values) == parser._INTERNED_VALUES_SIZE
 
 
 def test_parse_parameter_with_range():
@@ -0,0 +1,69 @@
+import asyncio
+from unittest import mock
+
+import pytest
+import tanjun
+
+from tanchi import commands, profiling
+
+
+async def sleep_for(duration: float) -> float:
+    await asyncio.sleep(duration)
+    return duration
+
+
+@pytest.mark.asyncio
+async def test_profiler_keeps_slowest():
+    profiler = profiling.Profiler(keep=2)
+
+    for duration in (0.01, 0.03, 0.02):
+        assert await profiler.run("sleep", sleep_for, duration) == duration
+
+    profiles = profiler.get_profiles("sleep")
+    assert len(profiles) == 2
+    assert profiles[0].duration >= profiles[1].duration >= 0.015
+    assert "sleep_for" in profiler.dump()
+
+
+@pytest.mark.asyncio
+async def test_profiler_threshold():
+    profiler = profiling.Profiler(threshold=0.02)
+
+    await profiler.run("sleep", sleep_for, 0)
+    await profiler.run("sleep", sleep_for, 0.03)
+
+    assert len(profiler.get_profiles()) == 1
+
+
+@pytest.mark.asyncio
+async def test_profiler_sample_rate():
+    profiler = profiling.Profiler(sample_rate=0)
+
+    await profiler.run("sleep", sleep_for, 0)
+
+    assert not profiler.get_profiles()
+
+
+def test_profiler_dump_stats(tmp_path):
+    profiler = profiling.Profiler()
+    asyncio.run(profiler.run("sleep", sleep_for, 0))
+
+    paths = profiler.dump_stats(str(tmp_path))
+    assert len(paths) == 1 and paths[0].endswith(".prof")
+
+
+@pytest.mark.asyncio
+async def test_command_profiler():
+    profiler = profiling.Profiler()
+
+    @commands.as_slash_command(profiler=profiler)
+    async def command(context: tanjun.abc.SlashContext):
+        """Command description."""
+
+    assert command.profiler is profiler
+
+    context = mock.AsyncMock()
+    context.set_command = mock.Mock(return_value=context)
+    await command.execute(context)
+
+    assert profiler.get_profiles("command")
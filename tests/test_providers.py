@@ -0,0 +1,83 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from tanchi import providers
+
+
+class Fetcher:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, scope):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return (scope, self.calls)
+
+
+@pytest.mark.asyncio
+async def test_coalesced_fetch():
+    fetch = Fetcher()
+    provider = providers.DataProvider(fetch)
+
+    results = await asyncio.gather(*(provider.get() for _ in range(10)))
+
+    assert fetch.calls == 1
+    assert set(results) == {(None, 1)}
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate():
+    fetch = Fetcher()
+    provider = providers.DataProvider(fetch, ttl=0)
+
+    assert await provider.get() == (None, 1)
+    # stale data is served immediately while refreshing
+    assert await provider.get() == (None, 1)
+    await provider.refresh()
+
+    assert await provider.get() == (None, 2)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_snapshot():
+    data = ["data"]
+
+    def fetch(scope):
+        if not data:
+            raise RuntimeError("backend is down")
+        return data.pop()
+
+    provider = providers.DataProvider(fetch, ttl=0)
+    assert await provider.get() == "data"
+
+    with pytest.raises(RuntimeError):
+        await provider.refresh()
+
+    assert await provider.get() == "data"
+
+
+@pytest.mark.asyncio
+async def test_per_guild_eviction():
+    fetch = Fetcher()
+    provider = providers.DataProvider(fetch, per_guild=True, max_scopes=2)
+
+    for guild_id in (1, 2, 1, 3):
+        assert (await provider.get(mock.Mock(guild_id=guild_id)))[0] == guild_id
+
+    assert len(provider) == 2
+    assert fetch.calls == 3
+
+    await provider.get(mock.Mock(guild_id=2))
+    assert fetch.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_idle_eviction():
+    provider = providers.DataProvider(Fetcher(), idle_timeout=60)
+    await provider.get()
+
+    assert len(provider) == 1
+    provider._evict(float("inf"))
+    assert len(provider) == 0
@@ -0,0 +1,194 @@
+from unittest import mock
+
+import hikari
+import pytest
+import tanjun
+
+from tanchi import autocompletion, commands, ranking
+
+
+@pytest.fixture
+def client():
+    return tanjun.Client.from_gateway_bot(mock.Mock())
+
+
+def test_sketch_estimate():
+    sketch = ranking.CountMinSketch(64, 4, half_life=None)
+    for _ in range(5):
+        sketch.add("apple")
+    sketch.add("pear", 2)
+
+    assert sketch.estimate("apple") >= 5
+    assert sketch.estimate("pear") >= 2
+    assert len(sketch) == 256
+
+
+def test_sketch_never_underestimates():
+    sketch = ranking.CountMinSketch(8, 2, half_life=None)
+    for value in range(100):
+        for _ in range(value % 7):
+            sketch.add(value)
+
+    assert all(sketch.estimate(value) >= value % 7 for value in range(100))
+
+
+def test_sketch_decay():
+    sketch = ranking.CountMinSketch(64, 4, half_life=4)
+    for _ in range(4):
+        sketch.add("apple")
+
+    assert sketch.estimate("apple") == 2
+
+    sketch.add("apple")
+    assert sketch.estimate("apple") == 3
+
+
+def test_sketch_renormalizes():
+    sketch = ranking.CountMinSketch(64, 4, half_life=None)
+    sketch.add("apple", 8)
+    for _ in range(41):
+        sketch.decay()
+
+    sketch.add("pear")
+    assert sketch.estimate("apple") == pytest.approx(8 / 2**41)
+    assert sketch.estimate("pear") == 1
+
+
+def test_rank():
+    tracker = ranking.Popularity()
+    assert tracker.rank("eat", "fruit", ["apple", "banana", "cherry"], limit=2) == ["apple", "banana"]
+
+    tracker.record("eat", "fruit", "cherry")
+    tracker.record("eat", "fruit", "cherry")
+    tracker.record("eat", "fruit", "banana")
+
+    assert tracker.rank("eat", "fruit", ["apple", "banana", "cherry"]) == ["cherry", "banana", "apple"]
+    assert tracker.rank("eat", "fruit", {"Apple": "apple", "Cherry": "cherry"}) == {
+        "Cherry": "cherry",
+        "Apple": "apple",
+    }
+    assert tracker.estimate("eat", "vegetable", "cherry") == 0
+    assert tracker.estimate("plant", "fruit", "cherry") == 0
+
+
+@pytest.mark.asyncio
+async def test_popular_choices_are_boosted(client: tanjun.Client):
+    tracker = ranking.Popularity()
+    tracker.record("command", "string", "A99")
+
+    autocompleter = autocompletion.Autocompleter(
+        lambda context, value: [f"{value}{number}" for number in range(100)], popularity=tracker
+    )
+
+    interaction = mock.AsyncMock()
+    interaction.command_name = "command"
+    interaction.options = [
+        hikari.AutocompleteInteractionOption(
+            name="string", type=hikari.OptionType.STRING, value="A", options=None, is_focused=True
+        )
+    ]
+    await autocompleter(tanjun.context.AutocompleteContext(client, interaction), "A")
+
+    choices = interaction.create_response.await_args.args[0]
+    assert len(choices) == 25
+    assert [choice.value for choice in choices[:3]] == ["A99", "A0", "A1"]
+
+
+@pytest.mark.asyncio
+async def test_precomputed_choices_are_ranked():
+    tracker = ranking.Popularity()
+    autocompleter = autocompletion.Autocompleter(
+        lambda context, value: [value], popularity=tracker, context_independent=True
+    )
+    autocompleter.set_precomputed(
+        ("command", "string", None), "A", autocompletion.ChoicePayload(["A0", "A1", "A2"]), ttl=None
+    )
+    tracker.record("command", "string", "A2")
+
+    context = mock.Mock(guild_id=None, has_responded=False)
+    context.interaction.command_name = "command"
+    context.interaction.options = []
+    context.focused.name = "string"
+    context.focused.value = "A"
+    context.set_choices = mock.AsyncMock()
+    await autocompleter(context, "A")
+
+    assert list(context.set_choices.await_args.args[0].values()) == ["A2", "A0", "A1"]
+    assert autocompleter.stats == {"precomputed": 1}
+
+
+@pytest.mark.asyncio
+async def test_returned_payloads_are_ranked():
+    tracker = ranking.Popularity()
+    tracker.record("command", "string", "A2")
+    payload = autocompletion.ChoicePayload(["A0", "A1", "A2"])
+    autocompleter = autocompletion.Autocompleter(lambda context, value: payload, popularity=tracker)
+
+    context = mock.Mock(guild_id=None, has_responded=False)
+    context.interaction.command_name = "command"
+    context.interaction.options = []
+    context.focused.name = "string"
+    context.focused.value = "A"
+    context.set_choices = mock.AsyncMock()
+    await autocompleter(context, "A")
+
+    assert list(context.set_choices.await_args.args[0].values()) == ["A2", "A0", "A1"]
+
+
+def test_distinct_autocompleters():
+    def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        return [value]
+
+    tracker = ranking.Popularity()
+    ranked = autocompletion.as_autocomplete(callback, popularity=tracker)
+    assert ranked is not autocompletion.as_autocomplete(callback)
+    assert autocompletion.as_autocomplete(callback, popularity=tracker) is ranked
+
+
+@pytest.mark.asyncio
+async def test_command_records_submitted_values():
+    tracker = ranking.Popularity()
+
+    @commands.as_slash_command(popularity=tracker)
+    async def command(context: tanjun.abc.SlashContext, fruit: str, amount: int):
+        """Command description.
+
+        Args:
+            fruit: The fruit.
+            amount: How many.
+        """
+
+    context = mock.AsyncMock(has_responded=False)
+    context.set_command = mock.Mock(return_value=context)
+    context.options = {
+        "fruit": mock.Mock(type=hikari.OptionType.STRING, value="cherry"),
+        "amount": mock.Mock(type=hikari.OptionType.INTEGER, value=3),
+        "member": mock.Mock(type=hikari.OptionType.USER, value=1234),
+    }
+    await command.execute(context)
+
+    assert tracker.estimate("command", "fruit", "cherry") >= 1
+    assert tracker.estimate("command", "amount", 3) >= 1
+    assert ("command", "member") not in tracker.sketches
+
+
+@pytest.mark.asyncio
+async def test_subcommand_records_full_name():
+    tracker = ranking.Popularity()
+
+    @commands.as_slash_command(popularity=tracker)
+    async def eat(context: tanjun.abc.SlashContext, fruit: str):
+        """Command description.
+
+        Args:
+            fruit: The fruit.
+        """
+
+    tanjun.slash_command_group("food", "Food.").add_command(eat)
+
+    context = mock.AsyncMock(has_responded=False)
+    context.set_command = mock.Mock(return_value=context)
+    context.options = {"fruit": mock.Mock(type=hikari.OptionType.STRING, value="cherry")}
+    await eat.execute(context)
+
+    assert list(tracker.sketches) == [("food eat", "fruit")]
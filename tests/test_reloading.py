@@ -0,0 +1,128 @@
+import sys
+import textwrap
+
+import pytest
+import tanjun
+
+from tanchi import reloading
+
+SOURCE = '''
+import tanchi
+import tanjun
+
+{helpers}
+
+@tanchi.as_slash_command()
+async def first(context: tanjun.abc.SlashContext, option: {annotation}):
+    """First command."""
+
+
+@tanchi.as_slash_command()
+async def second(context: tanjun.abc.SlashContext):
+    """Second command."""
+    {body}
+
+{third}
+'''
+
+THIRD = '''
+@tanchi.as_slash_command()
+async def third(context: tanjun.abc.SlashContext):
+    """{description}"""
+'''
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+
+    def write(**kwargs: str) -> str:
+        third = THIRD.format(description=kwargs.pop("description", "Third command."))
+        kwargs = {"annotation": "str", "body": "pass", "helpers": "", "third": third, **kwargs}
+        (tmp_path / "reloaded_commands.py").write_text(textwrap.dedent(SOURCE.format(**kwargs)))
+        return "reloaded_commands"
+
+    yield write
+    sys.modules.pop("reloaded_commands", None)
+
+
+def test_reload(module):
+    reloader = reloading.Reloader()
+
+    result = reloader.load(module())
+    assert result.added == ["first", "second", "third"]
+    first = result.commands["first"]
+
+    result = reloader.load(module(body="await context.respond('hi')", description="Third command!"))
+    assert result.unchanged == ["first"]
+    assert result.changed == ["second", "third"]
+    assert result.commands["first"] is first
+
+    # only the description of the third command is declared to discord
+    assert [command.name for command in result.updates] == ["third"]
+
+
+def test_reload_changed_range(module):
+    reloader = reloading.Reloader()
+    first = reloader.load(module(annotation="tanchi.Range[1, 10]")).commands["first"]
+
+    result = reloader.load(module(annotation="tanchi.Range[1, 20]"))
+    assert result.changed == ["first"]
+    assert result.commands["first"] is not first
+    assert [command.name for command in result.updates] == ["first"]
+
+
+HELPERS = """
+def to_upper(value: str) -> str:
+    return value.{method}()
+
+
+def words(context: tanjun.abc.AutocompleteContext, value: str):
+    return [value]
+"""
+
+
+@pytest.mark.parametrize("annotation", ["tanchi.Converted[to_upper]", "tanchi.Autocompleted[words, to_upper]"])
+def test_reload_module_local_callbacks(module, annotation):
+    reloader = reloading.Reloader()
+    first = reloader.load(module(annotation=annotation, helpers=HELPERS.format(method="upper"))).commands["first"]
+
+    result = reloader.load(module(annotation=annotation, helpers=HELPERS.format(method="upper")))
+    assert result.unchanged == ["first", "second", "third"]
+    assert result.commands["first"] is first
+
+    result = reloader.load(module(annotation=annotation, helpers=HELPERS.format(method="lower")))
+    assert result.changed == ["first"]
+
+
+def test_failed_reload_keeps_commands(module):
+    reloader = reloading.Reloader()
+    reloader.load(module())
+
+    with pytest.raises(ZeroDivisionError):
+        reloader.load(module(helpers="1 / 0"))
+
+    assert isinstance(sys.modules["reloaded_commands"].first, tanjun.abc.SlashCommand)
+    assert isinstance(sys.modules["reloaded_commands"].third, tanjun.abc.SlashCommand)
+
+
+def test_reload_removed(module):
+    reloader = reloading.Reloader()
+    reloader.load(module())
+
+    component = tanjun.Component()
+    for command in reloader._commands["reloaded_commands"].values():
+        component.add_slash_command(command)
+
+    result = reloader.load(module(third=""))
+    assert result.removed == ["third"]
+
+    result.apply(component)
+    assert sorted(command.name for command in component.slash_commands) == ["first", "second"]
+
+
+def test_build_without_reloader():
+    calls = []
+    reloading.build(lambda: None, lambda function, **kwargs: calls.append(kwargs), name="name")
+    assert calls == [{"name": "name"}]
@@ -0,0 +1,83 @@
+import sys
+
+import pytest
+
+from tanchi import __main__, startup
+
+SOURCE = '''
+import typing
+
+import hikari
+import tanchi
+import tanjun
+
+
+@tanchi.as_slash_command()
+async def small(context: tanjun.abc.SlashContext):
+    """Small command."""
+
+
+@tanchi.as_slash_command()
+async def large(
+    context: tanjun.abc.SlashContext,
+    first: str,
+    second: typing.Optional[hikari.User] = None,
+    third: typing.Literal["a", "b"] = "a",
+):
+    """Large command.
+
+    Args:
+        first: First option.
+        second: Second option.
+        third: Third option.
+    """
+'''
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    (tmp_path / "startup_commands.py").write_text(SOURCE)
+    yield "startup_commands"
+    sys.modules.pop("startup_commands", None)
+
+
+def test_profile_startup(module):
+    report = startup.profile_startup(module)
+
+    assert list(report.modules) == [module]
+    assert {command.name for command in report.commands} == {"small", "large"}
+    assert [command.duration for command in report.commands] == sorted(
+        (command.duration for command in report.commands), reverse=True
+    )
+
+    large = next(command for command in report.commands if command.name == "large")
+    assert large.module == module
+    assert set(large.phases) == set(startup.PHASES)
+    assert large.allocated > 0
+
+    assert {annotation.annotation for annotation in report.annotations} == {
+        "<class 'str'>",
+        "typing.Optional[hikari.users.User]",
+        "typing.Literal['a', 'b']",
+    }
+    assert startup._active is None
+
+
+def test_profile_startup_without_memory(module):
+    report = startup.profile_startup(module, trace_memory=False)
+
+    assert all(command.allocated == 0 for command in report.commands)
+
+
+def test_not_recording():
+    assert startup.record(lambda: None) is None
+
+
+def test_main(module, capsys):
+    assert __main__.main(["profile", module, "--no-memory"]) == 0
+
+    output = capsys.readouterr().out
+    assert "large" in output
+    assert "typing.Literal['a', 'b']" in output
@@ -0,0 +1,143 @@
+import asyncio
+import typing
+from unittest import mock
+
+import alluka
+import hikari
+import pytest
+import tanjun
+
+from tanchi import autocompletion, warming
+
+
+def test_common_prefixes():
+    sample = ["apple", "apricot", "banana", "a"]
+
+    assert warming.common_prefixes(sample) == ["", "a", "ap", "b", "ba"]
+    assert warming.common_prefixes(sample, max_length=1, limit=2) == ["", "a"]
+
+
+def make_context(value: str, *, option: str = "option", guild_id: typing.Optional[int] = 1) -> mock.Mock:
+    context = mock.Mock()
+    context.interaction.command_name = "group"
+    context.interaction.options = [
+        hikari.AutocompleteInteractionOption(
+            name="command", type=hikari.OptionType.SUB_COMMAND, value=None, options=[], is_focused=False
+        )
+    ]
+    context.focused.name = option
+    context.focused.value = value
+    context.guild_id = guild_id and hikari.Snowflake(guild_id)
+    context.has_responded = False
+    context.set_choices = mock.AsyncMock()
+    return context
+
+
+@pytest.mark.asyncio
+async def test_warmup():
+    running = 0
+    peak = 0
+
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+        if value == "fail":
+            raise ValueError(value)
+        if value == "set":
+            await context.set_choices({"set": "set"})
+            return None
+
+        return [value, "other"]
+
+    autocompleter = autocompletion.as_autocomplete(callback, context_independent=True)
+    report = (
+        await warming.Warmup(concurrency=2)
+        .add(autocompleter, ["", "a", "b", "set", "fail"], command="group command", option="option", guild_ids=[1])
+        .run()
+    )
+
+    assert peak == 2
+    assert report.warmed == 4
+    assert list(report.failed) == [("callback", ("group command", "option", 1), "fail")]
+
+    context = make_context("set")
+    await autocompleter(context, "set")
+    context.set_choices.assert_awaited_once_with({"set": "set"})
+
+
+@pytest.mark.asyncio
+async def test_warmup_is_scoped():
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str):
+        return [f"{context.interaction.command_name}-{context.guild_id}-{value}"]
+
+    autocompleter = autocompletion.as_autocomplete(callback, context_independent=True)
+    warmup = warming.Warmup().add(autocompleter, ["a"], command="group command", option="option", guild_ids=[1])
+    assert warmup.ttl is not None
+    await warmup.run()
+
+    warmed = make_context("a")
+    await autocompleter(warmed, "a")
+    assert autocompleter.stats["precomputed"] == 1
+    warmed.set_choices.assert_awaited_once_with({"group-1-a": "group-1-a"})
+
+    for context in (make_context("a", guild_id=2), make_context("a", option="other")):
+        await autocompleter(context, "a")
+
+    assert autocompleter.stats == {"precomputed": 1, "completed": 2}
+
+
+@pytest.mark.asyncio
+async def test_warmup_injects_dependencies():
+    class Database:
+        def search(self, value: str) -> typing.List[str]:
+            return [value.upper()]
+
+    async def callback(context: tanjun.abc.AutocompleteContext, value: str, db: Database = alluka.inject()):
+        return db.search(value)
+
+    injector = alluka.Client().set_type_dependency(Database, Database())
+    autocompleter = autocompletion.as_autocomplete(callback, context_independent=True)
+    report = (
+        await warming.Warmup()
+        .add(autocompleter, ["a"], command="command", option="option", guild_ids=[None])
+        .run(injector)
+    )
+    assert report.warmed == 1 and not report.failed
+
+
+@pytest.mark.asyncio
+async def test_precomputed_expire():
+    callback = mock.Mock(return_value=["live"])
+    autocompleter = autocompletion.Autocompleter(callback, context_independent=True)
+    autocompleter.set_precomputed(("group command", "option", 1), "a", autocompletion.ChoicePayload(["warm"]), ttl=0)
+
+    context = make_context("a")
+    await autocompleter(context, "a")
+
+    context.set_choices.assert_awaited_once_with({"live": "live"})
+
+
+def test_install():
+    client = mock.Mock()
+    warming.Warmup().install(client)
+
+    client.add_client_callback.assert_called_once_with(tanjun.ClientCallbackNames.STARTING, mock.ANY)
+
+
+def test_only_tanchi_autocompleters():
+    with pytest.raises(TypeError):
+        warming.Warmup().add(mock.Mock(), [""], command="command", option="option", guild_ids=[None])
+
+
+def test_only_context_independent_autocompleters():
+    autocompleter = autocompletion.as_autocomplete(mock.Mock())
+
+    with pytest.raises(ValueError):
+        warming.Warmup().add(autocompleter, [""], command="command", option="option", guild_ids=[None])
+
+    with pytest.raises(ValueError):
+        autocompleter.set_precomputed(("command", "option", None), "", autocompletion.ChoicePayload([]), ttl=None)